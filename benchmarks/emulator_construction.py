@@ -0,0 +1,42 @@
+import ctypes
+import timeit
+
+import numpy as np
+from pyautd3 import AUTD3
+from pyautd3.driver.geometry.geometry import Geometry
+from pyautd3.native_methods.structs import Point3, Quaternion
+
+from pyautd3_emulator import Emulator
+from pyautd3_emulator.native_methods.autd3capi_emulator import NativeMethods as Emu
+
+
+def eager(devices: list[AUTD3]) -> None:
+    # What Emulator.__init__ used to do: per-device ctypes conversion and an eagerly wrapped Geometry.
+    pos = np.fromiter((np.void(Point3(d.pos)) for d in devices), dtype=Point3)  # type: ignore[no-matching-overload]
+    rot = np.fromiter((np.void(Quaternion(d.rot)) for d in devices), dtype=Quaternion)  # type: ignore[no-matching-overload]
+    ptr = Emu().emulator(pos.ctypes.data_as(ctypes.POINTER(Point3)), rot.ctypes.data_as(ctypes.POINTER(Quaternion)), len(devices))
+    Geometry(Emu().emulator_geometry(ptr))
+    Emu().emulator_free(ptr)
+
+
+def init(devices: list[AUTD3]) -> None:
+    with Emulator(devices):
+        pass
+
+
+def from_arrays(pos: np.ndarray, rot: np.ndarray) -> None:
+    with Emulator.from_arrays(pos, rot):
+        pass
+
+
+if __name__ == "__main__":
+    print(f"{'devices':>8} {'eager[ms]':>13} {'__init__[ms]':>13} {'from_arrays[ms]':>16} {'speedup':>8}")
+    for n in (1, 10, 100, 1_000):
+        pos = np.stack([192.0 * (np.arange(n) % 32), 151.4 * (np.arange(n) // 32), np.zeros(n)], axis=1)
+        rot = np.tile([1.0, 0.0, 0.0, 0.0], (n, 1))
+        devices = [AUTD3(pos=p, rot=r) for p, r in zip(pos, rot, strict=True)]
+        number = max(1, 1_000 // n)
+        t_eager = min(timeit.repeat(lambda devices=devices: eager(devices), number=number, repeat=5)) / number * 1e3
+        t_init = min(timeit.repeat(lambda devices=devices: init(devices), number=number, repeat=5)) / number * 1e3
+        t_arr = min(timeit.repeat(lambda pos=pos, rot=rot: from_arrays(pos, rot), number=number, repeat=5)) / number * 1e3
+        print(f"{n:>8} {t_eager:>13.3f} {t_init:>13.3f} {t_arr:>16.3f} {t_eager / t_arr:>8.1f}")
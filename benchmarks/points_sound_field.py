@@ -0,0 +1,37 @@
+import argparse
+import resource
+import time
+
+import numpy as np
+from pyautd3 import AUTD3, Focus, Static
+from pyautd3.gain.focus import FocusOption
+from pyautd3.utils import Duration
+
+from pyautd3_emulator import Emulator, InstantRecordOption, Points, Recorder, RmsRecordOption
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sound field at scattered observation points")
+    parser.add_argument("--points", type=int, nargs="+", default=[500, 10_000])
+    parser.add_argument("--periods", type=int, default=4, help="number of 25us periods to compute")
+    parser.add_argument("--devices", type=int, default=2)
+    parser.add_argument("--shards", type=int, default=1)
+    args = parser.parse_args()
+
+    with Emulator([AUTD3(pos=[192.0 * i, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0]) for i in range(args.devices)]) as emulator:
+        focus = emulator.center() + np.array([0.0, 0.0, 150.0])
+
+        def f(autd: Recorder) -> None:
+            autd.send((Static(intensity=0xFF), Focus(pos=focus, option=FocusOption())))
+            autd.tick(Duration.from_micros(25 * args.periods))
+
+        record = emulator.record(f)
+        rng = np.random.default_rng(0)
+        print(f"{'option':>8} {'points':>8} {'elapsed[s]':>11} {'max RSS[MB]':>12}")
+        for n in args.points:
+            points = Points(rng.uniform([0.0, 0.0, 20.0], [192.0 * args.devices, 151.4, 200.0], size=(n, 3)))
+            for name, option in (("Instant", InstantRecordOption(time_step=Duration.from_micros(1))), ("Rms", RmsRecordOption())):
+                start = time.perf_counter()
+                record.sound_field(points, option, shards=args.shards).next(Duration.from_micros(25 * args.periods))
+                elapsed = time.perf_counter() - start
+                rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+                print(f"{name:>8} {n:>8} {elapsed:>11.3f} {rss:>12.1f}")
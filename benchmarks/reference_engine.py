@@ -0,0 +1,48 @@
+import argparse
+import time
+
+import numpy as np
+from pyautd3 import AUTD3, Focus, Static
+from pyautd3.gain.focus import FocusOption
+from pyautd3.utils import Duration
+
+from pyautd3_emulator import Emulator, Engine, InstantRecordOption, RangeXYZ, Recorder, RmsRecordOption
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Native vs NumPy sound field engine")
+    parser.add_argument("--size", type=float, default=20.0, help="edge length of the square grid [mm]")
+    parser.add_argument("--resolution", type=float, default=1.0, help="grid resolution [mm]")
+    parser.add_argument("--periods", type=int, default=24, help="number of 25us periods to compute")
+    parser.add_argument("--devices", type=int, default=1)
+    args = parser.parse_args()
+
+    with Emulator([AUTD3(pos=[192.0 * i, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0]) for i in range(args.devices)]) as emulator:
+        focus = emulator.center() + np.array([0.0, 0.0, 150.0])
+
+        def f(autd: Recorder) -> None:
+            autd.send((Static(intensity=0xFF), Focus(pos=focus, option=FocusOption())))
+            autd.tick(Duration.from_micros(25 * args.periods))
+
+        record = emulator.record(f)
+        half = args.size / 2
+        range_ = RangeXYZ(
+            x=(focus[0] - half, focus[0] + half),
+            y=(focus[1] - half, focus[1] + half),
+            z=(focus[2], focus[2]),
+            resolution=args.resolution,
+        )
+
+        print(f"{'option':>8} {'native[s]':>10} {'numpy[s]':>10} {'ratio':>8} {'max abs err':>12} {'max':>10}")
+        for name, option in (("Instant", InstantRecordOption()), ("Rms", RmsRecordOption())):
+            elapsed = {}
+            values = {}
+            for engine in Engine:
+                sound_field = record.sound_field(range_, option, engine=engine)
+                start = time.perf_counter()
+                _, values[engine] = sound_field.next_grid(Duration.from_micros(25 * args.periods))
+                elapsed[engine] = time.perf_counter() - start
+            err = np.abs(values[Engine.Native] - values[Engine.NumPy]).max()
+            print(
+                f"{name:>8} {elapsed[Engine.Native]:>10.3f} {elapsed[Engine.NumPy]:>10.3f} "
+                f"{elapsed[Engine.NumPy] / elapsed[Engine.Native]:>8.2f} {err:>12.4g} {np.abs(values[Engine.Native]).max():>10.4g}"
+            )
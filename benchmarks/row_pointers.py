@@ -0,0 +1,29 @@
+import ctypes
+import timeit
+
+import numpy as np
+
+from pyautd3_emulator.utils import _row_pointers
+
+
+def generator(v: np.ndarray) -> "ctypes._Pointer[ctypes._Pointer[ctypes.c_float]]":
+    return ctypes.cast(
+        (ctypes.POINTER(ctypes.c_float) * v.shape[0])(
+            *(ctypes.cast(r, ctypes.POINTER(ctypes.c_float)) for r in np.ctypeslib.as_ctypes(v)),
+        ),
+        ctypes.POINTER(ctypes.POINTER(ctypes.c_float)),
+    )
+
+
+def vectorized(v: np.ndarray) -> "ctypes._Pointer[ctypes._Pointer[ctypes.c_float]]":
+    return _row_pointers(v, ctypes.c_float)
+
+
+if __name__ == "__main__":
+    print(f"{'rows':>8} {'generator[us]':>14} {'vectorized[us]':>15} {'speedup':>8}")
+    for rows in (10, 100, 1_000, 10_000, 100_000):
+        v = np.zeros([rows, 4], dtype=np.float32)
+        number = max(1, 100_000 // rows)
+        t_gen = min(timeit.repeat(lambda v=v: generator(v), number=number, repeat=5)) / number * 1e6
+        t_vec = min(timeit.repeat(lambda v=v: vectorized(v), number=number, repeat=5)) / number * 1e6
+        print(f"{rows:>8} {t_gen:>14.2f} {t_vec:>15.2f} {t_gen / t_vec:>8.1f}")
@@ -0,0 +1,47 @@
+import argparse
+import os
+import time
+
+import numpy as np
+from pyautd3 import AUTD3, Focus, Static
+from pyautd3.gain.focus import FocusOption
+from pyautd3.utils import Duration
+
+from pyautd3_emulator import Emulator, InstantRecordOption, RangeXYZ, Recorder, RmsRecordOption
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scaling of spatially sharded sound field computation")
+    parser.add_argument("--size", type=float, default=40.0, help="edge length of the cubic grid [mm]")
+    parser.add_argument("--resolution", type=float, default=1.0, help="grid resolution [mm]")
+    parser.add_argument("--rms", action="store_true", help="benchmark Rms instead of Instant")
+    parser.add_argument("--max-shards", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with Emulator([AUTD3(pos=[0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0])]) as emulator:
+        focus = emulator.center() + np.array([0.0, 0.0, 150.0])
+
+        def f(autd: Recorder) -> None:
+            autd.send((Static(intensity=0xFF), Focus(pos=focus, option=FocusOption())))
+            autd.tick(Duration.from_micros(25 * 4))
+
+        record = emulator.record(f)
+        half = args.size / 2
+        range_ = RangeXYZ(
+            x=(focus[0] - half, focus[0] + half),
+            y=(focus[1] - half, focus[1] + half),
+            z=(focus[2] - half, focus[2] + half),
+            resolution=args.resolution,
+        )
+        option = RmsRecordOption() if args.rms else InstantRecordOption()
+
+        shards = 1
+        baseline = None
+        print(f"{'shards':>6} {'time[s]':>10} {'speedup':>8}")
+        while shards <= args.max_shards:
+            sound_field = record.sound_field(range_, option, shards=shards)
+            start = time.perf_counter()
+            sound_field.next(Duration.from_micros(25 * 4))
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(f"{shards:>6} {elapsed:>10.3f} {baseline / elapsed:>8.2f}")
+            shards *= 2
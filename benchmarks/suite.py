@@ -0,0 +1,175 @@
+import argparse
+import functools
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from importlib.metadata import version
+from pathlib import Path
+from typing import TypedDict
+
+import numpy as np
+from pyautd3 import AUTD3, Focus, Static
+from pyautd3.gain.focus import FocusOption
+from pyautd3.utils import Duration
+
+from pyautd3_emulator import Emulator, InstantRecordOption, Layout, RangeXYZ, Recorder, RmsRecordOption
+from pyautd3_emulator.record import Record
+
+
+class Result(TypedDict):
+    name: str
+    params: dict
+    min: float
+    median: float
+    repeat: int
+
+
+def measure(f: Callable[[], object], repeat: int) -> tuple[float, float]:
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        elapsed.append(time.perf_counter() - start)
+    return min(elapsed), statistics.median(elapsed)
+
+
+def create(devices: int) -> Emulator:
+    return Emulator([AUTD3(pos=[192.0 * (i % 8), 151.4 * (i // 8), 0.0], rot=[1.0, 0.0, 0.0, 0.0]) for i in range(devices)])
+
+
+def construct(devices: int) -> None:
+    with create(devices):
+        pass
+
+
+def next_grid(record: Record, range_: RangeXYZ, option: InstantRecordOption | RmsRecordOption, duration: Duration) -> None:
+    record.sound_field(range_, option).next_grid(duration)
+
+
+def next_frame(record: Record, range_: RangeXYZ, option: InstantRecordOption | RmsRecordOption, duration: Duration, layout: Layout) -> None:
+    record.sound_field(range_, option).next(duration, layout=layout)
+
+
+def run(args: argparse.Namespace) -> None:
+    results: list[Result] = []
+
+    def bench(name: str, params: dict, f: Callable[[], object]) -> None:
+        fastest, median = measure(f, args.repeat)
+        r = Result(name=name, params=params, min=fastest, median=median, repeat=args.repeat)
+        print(f"{name:<32} {json.dumps(params):<72} {r['median'] * 1e3:>10.3f} ms", file=sys.stderr)
+        results.append(r)
+
+    for devices in args.devices:
+        bench("Emulator.__init__", {"devices": devices}, lambda devices=devices: construct(devices))
+
+    for devices, periods in itertools.product(args.devices, args.periods):
+        with create(devices) as emulator:
+            focus = emulator.center() + np.array([0.0, 0.0, 150.0])
+
+            def f(autd: Recorder, focus: np.ndarray = focus, periods: int = periods) -> None:
+                autd.send((Static(intensity=0xFF), Focus(pos=focus, option=FocusOption())))
+                autd.tick(Duration.from_micros(25 * periods))
+
+            params = {"devices": devices, "periods": periods}
+            bench("Emulator.record", params, lambda emulator=emulator, f=f: emulator.record(f))
+
+            record = emulator.record(f)
+            for accessor in ("phase", "pulse_width", "output_voltage", "output_ultrasound"):
+                bench(f"Record.{accessor}_array", params, getattr(record, f"{accessor}_array"))
+                for layout in Layout:
+                    bench(f"Record.{accessor}", {**params, "layout": layout.name}, functools.partial(getattr(record, accessor), layout=layout))
+
+            half = args.size / 2
+            duration = Duration.from_micros(25 * periods)
+            for resolution in args.resolution:
+                range_ = RangeXYZ(
+                    x=(focus[0] - half, focus[0] + half),
+                    y=(focus[1] - half, focus[1] + half),
+                    z=(focus[2], focus[2]),
+                    resolution=resolution,
+                )
+                options: list[tuple[str, InstantRecordOption | RmsRecordOption, dict]] = [
+                    (f"Instant@{t}ns", InstantRecordOption(time_step=Duration.from_nanos(t)), {"time_step": t}) for t in args.time_step
+                ]
+                options.append(("Rms", RmsRecordOption(), {}))
+                for name, option, extra in options:
+                    p = {**params, "resolution": resolution, **extra}
+                    kind = name.split("@")[0]
+                    bench(f"{kind}.next_grid", p, functools.partial(next_grid, record, range_, option, duration))
+                    for layout in Layout:
+                        bench(f"{kind}.next", {**p, "layout": layout.name}, functools.partial(next_frame, record, range_, option, duration, layout))
+
+    report = {
+        "metadata": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "numpy": version("numpy"),
+            "polars": version("polars"),
+            "pyautd3": version("pyautd3"),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output is None:
+        print(text)
+    else:
+        Path(args.output).write_text(text, encoding="utf-8")
+
+
+def compare(args: argparse.Namespace) -> int:
+    # Cases are matched by name and parameters; a case is a regression when its median slows down by more than the threshold.
+    def load(path: str) -> dict[str, dict]:
+        report = json.loads(Path(path).read_text(encoding="utf-8"))
+        return {f"{r['name']} {json.dumps(r['params'], sort_keys=True)}": r for r in report["results"]}
+
+    base = load(args.base)
+    new = load(args.new)
+    regressions = 0
+    print(f"{'case':<104} {'base[ms]':>10} {'new[ms]':>10} {'ratio':>7}")
+    for key in sorted(base.keys() & new.keys()):
+        ratio = new[key]["median"] / base[key]["median"]
+        flag = ""
+        if ratio > 1.0 + args.threshold:
+            flag = "REGRESSION"
+            regressions += 1
+        elif ratio < 1.0 / (1.0 + args.threshold):
+            flag = "improved"
+        print(f"{key:<104} {base[key]['median'] * 1e3:>10.3f} {new[key]['median'] * 1e3:>10.3f} {ratio:>7.2f} {flag}")
+    for key in sorted(base.keys() - new.keys()):
+        print(f"{key:<104} missing in {args.new}")
+    for key in sorted(new.keys() - base.keys()):
+        print(f"{key:<104} new in {args.new}")
+    print(f"{regressions} regression(s) with threshold {args.threshold:.0%}")
+    return 1 if regressions > 0 else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("run", help="run the benchmarks and write the results as JSON")
+    p.add_argument("--devices", type=int, nargs="+", default=[1, 4])
+    p.add_argument("--periods", type=int, nargs="+", default=[4, 40], help="tick duration in 25us periods")
+    p.add_argument("--size", type=float, default=20.0, help="edge length of the square grid [mm]")
+    p.add_argument("--resolution", type=float, nargs="+", default=[1.0, 2.0], help="grid resolution [mm]")
+    p.add_argument("--time-step", type=int, nargs="+", default=[1000], help="Instant time step [ns]")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--output", help="output JSON file, stdout if omitted")
+
+    p = commands.add_parser("compare", help="compare two runs and flag regressions")
+    p.add_argument("base")
+    p.add_argument("new")
+    p.add_argument("--threshold", type=float, default=0.1, help="relative slowdown of the median that counts as a regression")
+
+    args = parser.parse_args()
+    match args.command:
+        case "run":
+            run(args)
+        case "compare":
+            sys.exit(compare(args))
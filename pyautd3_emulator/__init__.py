@@ -1,15 +1,33 @@
+from .cache import Cache
 from .emulator import Emulator
 from .instant import InstantRecordOption
+from .layout import Layout
+from .parallel import SharedResult, compute_time_sharded
+from .points import Points
+from .profiler import Profiler
+from .progress import CancellationToken, Progress
 from .range import RangeXYZ
 from .recorder import Recorder
+from .reference import Engine
 from .rms import RmsRecordOption
+from .store import ChunkStore
 
 __all__ = [
+    "Cache",
+    "CancellationToken",
+    "ChunkStore",
     "Emulator",
+    "Engine",
     "InstantRecordOption",
+    "Layout",
+    "Points",
+    "Profiler",
+    "Progress",
     "RangeXYZ",
     "Recorder",
     "RmsRecordOption",
+    "SharedResult",
+    "compute_time_sharded",
 ]
 
 
@@ -0,0 +1,76 @@
+import itertools
+import math
+from collections.abc import Callable
+
+import numpy as np
+
+from pyautd3_emulator.range import RangeXYZ
+
+
+def _adaptive_rms(
+    evaluate: Callable[[np.ndarray], tuple[np.ndarray, np.ndarray]],
+    range_: RangeXYZ,
+    resolution: float,
+    *,
+    threshold: float,
+    gradient: float | None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # All points live on the integer lattice of the finest level. A point at level l refined with step s = 2^(levels - l)
+    # spawns its neighbours at +-s/2 along every axis that has more than one point; points already evaluated are reused.
+    axes = range_._axes()
+    counts = range_._counts()
+    coarse = float(np.float32(range_._inner.resolution))
+    levels = max(0, math.ceil(math.log2(coarse / resolution))) if resolution < coarse else 0
+    scale = 1 << levels
+    origin = np.array([float(axes[k][0]) for k in ("x", "y", "z")])
+    upper = np.array([(counts[k] - 1) * scale for k in ("x", "y", "z")])
+    refine = [i for i, k in enumerate(("x", "y", "z")) if counts[k] > 1]
+
+    z, y, x = np.meshgrid(*(np.arange(counts[k]) for k in ("z", "y", "x")), indexing="ij")
+    frontier = np.stack([x.ravel(), y.ravel(), z.ravel()], axis=1) * scale
+
+    lookup: dict[tuple[int, int, int], int] = {}
+    keys: list[np.ndarray] = []
+    values: list[np.ndarray] = []
+    point_levels = np.zeros(0, dtype=np.uint8)
+    time = np.zeros(0, dtype=np.uint64)
+    offset = 0
+    for level in range(levels + 1):
+        new = np.array([k for k in frontier.tolist() if tuple(k) not in lookup], dtype=np.int64).reshape(-1, 3)
+        if len(new) > 0:
+            time, v = evaluate((origin + new * (coarse / scale)).astype(np.float32))
+            keys.append(new)
+            values.append(v)
+            point_levels = np.concatenate([point_levels, np.full(len(new), level, dtype=np.uint8)])
+            lookup.update({(kx, ky, kz): offset + i for i, (kx, ky, kz) in enumerate(new.tolist())})
+            offset += len(new)
+        all_values = np.concatenate(values, axis=1)
+        idx = np.array([lookup[tuple(k)] for k in frontier.tolist()], dtype=np.int64)
+        point_levels[idx] = level
+        if level == levels or not refine:
+            break
+
+        step = scale >> level
+        score = all_values[:, idx].max(axis=0, initial=0.0)
+        mark = score >= threshold
+        if gradient is not None:
+            for i in refine:
+                for sign in (-1, 1):
+                    neighbors = frontier.copy()
+                    neighbors[:, i] += sign * step
+                    n_idx = np.array([lookup.get(tuple(k), -1) for k in neighbors.tolist()], dtype=np.int64)
+                    found = n_idx >= 0
+                    diff = np.abs(all_values[:, idx[found]] - all_values[:, n_idx[found]]).max(axis=0, initial=0.0)
+                    mark[found] |= diff / (step * coarse / scale) >= gradient
+
+        half = step // 2
+        shifts = np.zeros((3 ** len(refine), 3), dtype=np.int64)
+        shifts[:, refine] = np.array(list(itertools.product((-half, 0, half), repeat=len(refine))), dtype=np.int64)
+        children = (frontier[mark][:, np.newaxis, :] + shifts[np.newaxis, :, :]).reshape(-1, 3)
+        children = children[np.all((children >= 0) & (children <= upper), axis=1)]
+        frontier = np.unique(children, axis=0)
+
+    all_keys = np.concatenate(keys)
+    points = (origin + all_keys * (coarse / scale)).astype(np.float32)
+    res = (coarse / 2.0**point_levels).astype(np.float32)
+    return points, res, time, np.concatenate(values, axis=1)
@@ -0,0 +1,152 @@
+import hashlib
+import os
+import shutil
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from pyautd3.ethercat.dc_sys_time import DcSysTime
+from pyautd3.native_methods.autd3 import DcSysTime as _DcSysTime
+from pyautd3.utils import Duration
+
+from pyautd3_emulator.instant import InstantRecordOption
+from pyautd3_emulator.points import Points
+from pyautd3_emulator.range import RangeXYZ
+from pyautd3_emulator.record import Record, RecordFile
+from pyautd3_emulator.recorder import Recorder
+from pyautd3_emulator.rms import RmsRecordOption
+from pyautd3_emulator.store import ChunkStore
+
+if TYPE_CHECKING:
+    from pyautd3_emulator.emulator import Emulator
+
+_VERSION = b"1"
+
+
+class Cache:
+    path: Path
+    max_bytes: int
+
+    def __init__(self: Self, path: str | Path, *, max_bytes: int = 1024 * 1024 * 1024) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        (self.path / "records").mkdir(parents=True, exist_ok=True)
+        (self.path / "sound_fields").mkdir(parents=True, exist_ok=True)
+
+    def record(
+        self: Self,
+        emulator: "Emulator",
+        f: Callable[[Recorder], None],
+        *,
+        key: str,
+        start_time: DcSysTime | None = None,
+    ) -> Record | RecordFile:
+        # The drive timeline is only known after running f, so the caller names the scenario with key. On a hit the callback is
+        # not run at all and the record is read back from disk.
+        start_time = start_time or DcSysTime.__private_new__(_DcSysTime(0))
+        h = _digest(
+            b"record",
+            emulator.transducer_table().to_numpy().tobytes(),
+            start_time.sys_time().to_bytes(8, "little"),
+            key.encode(),
+        )
+        path = self.path / "records" / f"{h}.bin"
+        if path.exists():
+            _touch(path)
+            return Record.load(path)
+        record = emulator.record_from(start_time, f)
+        tmp = path.with_suffix(".tmp")
+        record.save(tmp)
+        tmp.replace(path)
+        self._evict(path)
+        return record
+
+    def sound_field(
+        self: Self,
+        record: Record | RecordFile,
+        range_: RangeXYZ | Points,
+        option: InstantRecordOption | RmsRecordOption,
+        duration: Duration,
+        *,
+        skip: Duration | None = None,
+        chunk: Duration | None = None,
+    ) -> ChunkStore:
+        h = _digest(
+            b"sound_field",
+            _timeline(record),
+            type(option).__name__.encode(),
+            bytes(option._inner),
+            bytes(range_._inner) if isinstance(range_, RangeXYZ) else range_._points.tobytes(),
+            (skip.as_nanos() if skip is not None else 0).to_bytes(8, "little"),
+            duration.as_nanos().to_bytes(8, "little"),
+        )
+        path = self.path / "sound_fields" / h
+        if path.exists():
+            _touch(path)
+            return ChunkStore.open(path)
+        # A loaded record computes the field with the NumPy engine.
+        sound_field = record.sound_field(range_, option)
+        if skip is not None:
+            sound_field.skip(skip)
+        tmp = path.with_name(f"{h}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        sound_field.to_store(tmp, duration, chunk)
+        tmp.replace(path)
+        self._evict(path)
+        return ChunkStore.open(path)
+
+    def size(self: Self) -> int:
+        return sum(size for _, size in self._entries())
+
+    def clear(self: Self) -> None:
+        for path, _ in self._entries():
+            _remove(path)
+
+    def _entries(self: Self) -> list[tuple[Path, int]]:
+        entries = [(p, p.stat().st_size) for p in (self.path / "records").glob("*.bin")]
+        entries += [
+            (p, sum(f.stat().st_size for f in p.iterdir())) for p in (self.path / "sound_fields").iterdir() if p.is_dir() and p.suffix != ".tmp"
+        ]
+        return entries
+
+    def _evict(self: Self, keep: Path | None = None) -> None:
+        # Least recently used entries go first; hits refresh the modification time. The entry just written is kept even if it
+        # alone exceeds max_bytes, so it can be returned, and goes first at the next insertion.
+        entries = sorted(self._entries(), key=lambda e: e[0].stat().st_mtime_ns)
+        total = sum(size for _, size in entries)
+        for path, size in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            _remove(path)
+            total -= size
+
+
+def _digest(*parts: bytes) -> str:
+    h = hashlib.sha256(_VERSION)
+    for part in parts:
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return h.hexdigest()
+
+
+def _timeline(record: Record | RecordFile) -> bytes:
+    h = hashlib.sha256()
+    h.update(record.transducer_table().to_numpy().tobytes())
+    time, phase = record.phase_array()
+    h.update(time.tobytes())
+    h.update(phase.tobytes())
+    h.update(record.pulse_width_array()[1].tobytes())
+    return h.digest()
+
+
+def _touch(path: Path) -> None:
+    os.utime(path)
+
+
+def _remove(path: Path) -> None:
+    if path.is_dir():
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        path.unlink(missing_ok=True)
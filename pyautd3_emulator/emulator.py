@@ -1,11 +1,16 @@
 import ctypes
-from collections.abc import Callable, Iterable
+import multiprocessing
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from types import TracebackType
 from typing import Self
 
 import numpy as np
 import polars as pl
+from numpy.typing import ArrayLike
 from pyautd3.driver.autd3_device import AUTD3
+from pyautd3.driver.geometry.device import Device
 from pyautd3.driver.geometry.geometry import Geometry
 from pyautd3.ethercat.dc_sys_time import DcSysTime
 from pyautd3.native_methods.autd3 import DcSysTime as _DcSysTime
@@ -16,23 +21,67 @@ from pyautd3.native_methods.utils import _validate_ptr
 
 from pyautd3_emulator.native_methods.autd3capi_emulator import EmulatorPtr
 from pyautd3_emulator.native_methods.autd3capi_emulator import NativeMethods as Emu
-from pyautd3_emulator.record import Record
+from pyautd3_emulator.record import Record, RecordFile
 from pyautd3_emulator.recorder import Recorder
 
 
 class Emulator(Geometry):
     _ptr: EmulatorPtr
+    _pos: np.ndarray
+    _rot: np.ndarray
+    _lazy_devices: list[Device] | None
 
     def __init__(self: Self, devices: Iterable[AUTD3]) -> None:
-        devices = list(devices)
-        pos = np.fromiter((np.void(Point3(d.pos)) for d in devices), dtype=Point3)  # type: ignore[no-matching-overload]
-        rot = np.fromiter((np.void(Quaternion(d.rot)) for d in devices), dtype=Quaternion)  # type: ignore[no-matching-overload]
+        self._new(*_poses(list(devices)))
+
+    @classmethod
+    def from_arrays(cls: type["Emulator"], pos: ArrayLike, rot: ArrayLike) -> "Emulator":
+        # Rotations are quaternions in (w, x, y, z) order, as in AUTD3.
+        pos = np.ascontiguousarray(pos, dtype=np.float32)
+        rot = np.ascontiguousarray(rot, dtype=np.float32)
+        if pos.ndim != 2 or pos.shape[1] != 3:  # noqa: PLR2004
+            err = "pos must be an array of shape (N, 3)"
+            raise ValueError(err)
+        if rot.shape != (len(pos), 4):
+            err = f"rot must be an array of shape ({len(pos)}, 4)"
+            raise ValueError(err)
+        emulator = cls.__new__(cls)
+        emulator._new(pos, rot)
+        return emulator
+
+    def _new(self: Self, pos: np.ndarray, rot: np.ndarray) -> None:
+        # Contiguous float32 rows have the memory layout of Point3 and Quaternion, so both are passed without conversion.
+        self._pos = pos
+        self._rot = rot
         self._ptr = Emu().emulator(
             pos.ctypes.data_as(ctypes.POINTER(Point3)),
             rot.ctypes.data_as(ctypes.POINTER(Quaternion)),
-            len(devices),
+            len(pos),
+        )
+        # Geometry.__init__ is not called because it wraps every device in a Python object up front, which dominates
+        # construction for large arrays; the devices are wrapped on first access instead. This relies on pyautd3 internals:
+        # Geometry.__init__ must set nothing but _geometry_ptr and _devices (the latter shadowed by the property below), which
+        # test_emulator_from_arrays checks so that a pyautd3 upgrade adding state fails loudly.
+        self._geometry_ptr = Emu().emulator_geometry(self._ptr)
+        self._lazy_devices = None
+
+    def reconfigure(self: Self, f: Callable[[Device], AUTD3]) -> None:
+        # The stored poses (used by record_many) and the lazily wrapped devices are both refreshed here.
+        pos, rot = _poses([f(d) for d in self])
+        Base().geometry_reconfigure(
+            self._geometry_ptr,
+            pos.ctypes.data_as(ctypes.POINTER(Point3)),  # type: ignore[arg-type]
+            rot.ctypes.data_as(ctypes.POINTER(Quaternion)),  # type: ignore[arg-type]
         )
-        super().__init__(Emu().emulator_geometry(self._ptr))
+        self._pos = pos
+        self._rot = rot
+        self._lazy_devices = None
+
+    @property
+    def _devices(self: Self) -> list[Device]:  # type: ignore[override]
+        if self._lazy_devices is None:
+            self._lazy_devices = [Device(i, self._geometry_ptr) for i in range(self.num_devices())]
+        return self._lazy_devices
 
     @property
     def geometry(self: Self) -> Geometry:
@@ -88,8 +137,38 @@ class Emulator(Geometry):
             _validate_ptr(
                 Emu().emulator_record_from(self._ptr, start_time._inner, f_native_),  # type: ignore[bad-argument-type]
             ),
+            self.transducer_table(),
         )
 
+    def record_many[T](
+        self: Self,
+        callbacks: Sequence[Callable[[Recorder], None]],
+        *,
+        max_workers: int | None = None,
+        extract: Callable[[Record], T] | None = None,
+        directory: str | Path | None = None,
+        start_time: DcSysTime | None = None,
+    ) -> list[RecordFile] | list[T]:
+        # Each callback is recorded in a worker process by an Emulator built from the same device poses, so callbacks and extract must
+        # be picklable (module-level functions or functools.partial of them). Without extract, every record is saved to
+        # directory, which is then required and owned by the caller, and returned as a memory-mapped RecordFile, so only
+        # max_workers records are ever held in memory.
+        start_ns = (start_time or DcSysTime.__private_new__(_DcSysTime(0))).sys_time()
+        if extract is not None:
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+                values = [executor.submit(_extract_worker, self._pos, self._rot, f, start_ns, extract) for f in callbacks]
+                return [fut.result() for fut in values]
+        if directory is None:
+            err = "directory is required when extract is not given"
+            raise ValueError(err)
+        root = Path(directory)
+        root.mkdir(parents=True, exist_ok=True)
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            paths = [
+                executor.submit(_record_worker, self._pos, self._rot, f, start_ns, root / f"record_{i:06d}.bin") for i, f in enumerate(callbacks)
+            ]
+            return [Record.load(fut.result()) for fut in paths]
+
     def __del__(self: Self) -> None:
         self._dispose()
 
@@ -108,3 +187,21 @@ class Emulator(Geometry):
         _traceback: TracebackType | None,
     ) -> None:
         self._dispose()
+
+
+def _poses(devices: list[AUTD3]) -> tuple[np.ndarray, np.ndarray]:
+    return (
+        np.array([d.pos for d in devices], dtype=np.float32).reshape(-1, 3),
+        np.array([d.rot for d in devices], dtype=np.float32).reshape(-1, 4),
+    )
+
+
+def _record_worker(pos: np.ndarray, rot: np.ndarray, f: Callable[[Recorder], None], start_ns: int, path: Path) -> Path:
+    with Emulator.from_arrays(pos, rot) as emulator:
+        emulator.record_from(DcSysTime.__private_new__(_DcSysTime(start_ns)), f).save(path)
+    return path
+
+
+def _extract_worker[T](pos: np.ndarray, rot: np.ndarray, f: Callable[[Recorder], None], start_ns: int, extract: Callable[[Record], T]) -> T:
+    with Emulator.from_arrays(pos, rot) as emulator:
+        return extract(emulator.record_from(DcSysTime.__private_new__(_DcSysTime(start_ns)), f))
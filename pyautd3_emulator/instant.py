@@ -1,14 +1,18 @@
 import ctypes
-from typing import Self
+from typing import TYPE_CHECKING, Self
 
 import numpy as np
-import polars as pl
 from pyautd3.native_methods.utils import _validate_status
 from pyautd3.utils import Duration
 
 from pyautd3_emulator.native_methods.autd3capi_emulator import InstantPtr
 from pyautd3_emulator.native_methods.autd3capi_emulator import InstantRecordOption as InstantRecordOption_
 from pyautd3_emulator.native_methods.autd3capi_emulator import NativeMethods as Emu
+from pyautd3_emulator.sound_field import SoundField
+from pyautd3_emulator.utils import _row_pointers
+
+if TYPE_CHECKING:
+    from pyautd3_emulator.record import Record
 
 
 class InstantRecordOption:
@@ -27,12 +31,19 @@ class InstantRecordOption:
             memory_limits_hint_mb,
         )
 
+    def _time_step(self: Self) -> Duration:
+        return Duration.__private_new__(self._inner.time_step)
+
 
-class Instant:
+class Instant(SoundField):
     _ptr: InstantPtr
+    _record: "Record"
+    _name = "p[Pa]"
 
-    def __init__(self: Self, ptr: InstantPtr) -> None:
+    def __init__(self: Self, ptr: InstantPtr, option: InstantRecordOption, record: "Record") -> None:
+        super().__init__(option._time_step(), int(option._inner.memory_limits_hint_mb))
         self._ptr = ptr
+        self._record = record
 
     def __del__(self: Self) -> None:
         self._dispose()
@@ -42,45 +53,26 @@ class Instant:
             Emu().emulator_sound_field_instant_free(self._ptr)
             self._ptr.value = None
 
-    def skip(self: Self, duration: Duration) -> Self:
+    def _points_len(self: Self) -> int:
+        return int(Emu().emulator_sound_field_instant_points_len(self._ptr))
+
+    def _time_len(self: Self, duration: Duration) -> int:
+        return int(Emu().emulator_sound_field_instant_time_len(self._ptr, duration._inner))
+
+    def _skip(self: Self, duration: Duration) -> None:
         _validate_status(Emu().emulator_sound_field_instant_skip(self._ptr, duration._inner))
-        return self
 
-    def observe_points(self: Self) -> pl.DataFrame:
-        points_len = int(Emu().emulator_sound_field_instant_points_len(self._ptr))
-        x = np.zeros(points_len, dtype=np.float32)
-        y = np.zeros(points_len, dtype=np.float32)
-        z = np.zeros(points_len, dtype=np.float32)
+    def _get_points(self: Self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> None:
         Emu().emulator_sound_field_instant_get_x(self._ptr, x.ctypes.data_as(ctypes.POINTER(ctypes.c_float)))
         Emu().emulator_sound_field_instant_get_y(self._ptr, y.ctypes.data_as(ctypes.POINTER(ctypes.c_float)))
         Emu().emulator_sound_field_instant_get_z(self._ptr, z.ctypes.data_as(ctypes.POINTER(ctypes.c_float)))
-        return pl.DataFrame(
-            {
-                "x[mm]": x,
-                "y[mm]": y,
-                "z[mm]": z,
-            },
-        )
-
-    def next(self: Self, duration: Duration) -> pl.DataFrame:
-        n = int(Emu().emulator_sound_field_instant_time_len(self._ptr, duration._inner))
-        points_len = int(Emu().emulator_sound_field_instant_points_len(self._ptr))
-        time = np.zeros(n, dtype=np.uint64)
 
-        v = np.zeros([n, points_len], dtype=np.float32)
+    def _next_into(self: Self, duration: Duration, time: np.ndarray, v: np.ndarray) -> None:
         _validate_status(
             Emu().emulator_sound_field_instant_next(
                 self._ptr,
                 duration._inner,
                 time.ctypes.data_as(ctypes.POINTER(ctypes.c_uint64)),
-                ctypes.cast(
-                    (ctypes.POINTER(ctypes.c_float) * n)(
-                        *(ctypes.cast(r, ctypes.POINTER(ctypes.c_float)) for r in np.ctypeslib.as_ctypes(v)),
-                    ),
-                    ctypes.POINTER(ctypes.POINTER(ctypes.c_float)),
-                ),
+                _row_pointers(v, ctypes.c_float),
             ),
         )
-        return pl.DataFrame(
-            {s.name: s for s in (pl.Series(name=f"p[Pa]@{time[i]}[ns]", values=v[i]) for i in range(n))},
-        )
@@ -0,0 +1,72 @@
+import functools
+from enum import Enum
+
+import numpy as np
+import polars as pl
+
+from pyautd3_emulator import profiler
+
+
+class Layout(Enum):
+    Wide = 0
+    Long = 1
+
+
+def _to_frame(
+    layout: Layout,
+    time: np.ndarray,
+    v: np.ndarray,
+    *,
+    name: str,
+    unit: str,
+    index: dict[str, np.ndarray],
+    ns_per_step: float | None = None,
+) -> pl.DataFrame:
+    if profiler._active is None:
+        return _build_frame(layout, time, v, name=name, unit=unit, index=index, ns_per_step=ns_per_step)
+    return profiler._timed_frame(
+        profiler._active,
+        f"DataFrame[{layout.name}]",
+        functools.partial(_build_frame, layout, time, v, name=name, unit=unit, index=index, ns_per_step=ns_per_step),
+    )
+
+
+def _build_frame(
+    layout: Layout,
+    time: np.ndarray,
+    v: np.ndarray,
+    *,
+    name: str,
+    unit: str,
+    index: dict[str, np.ndarray],
+    ns_per_step: float | None,
+) -> pl.DataFrame:
+    # Wide column names keep the time in unit. The Long time column is always in ns, converted from steps of ns_per_step when
+    # time is not already in ns.
+    match layout:
+        case Layout.Wide:
+            return pl.DataFrame({s.name: s for s in (pl.Series(name=f"{name}@{t}{unit}", values=r) for t, r in zip(time, v, strict=True))})
+        case Layout.Long:
+            n = v.shape[1]
+            return pl.DataFrame(
+                {
+                    "time[ns]": np.repeat(time if ns_per_step is None else time * ns_per_step, n),
+                    **{k: np.tile(idx, len(time)) for k, idx in index.items()},
+                    name: v.ravel(),
+                },
+            )
+        case _:  # pragma: no cover
+            raise NotImplementedError  # pragma: no cover
+
+
+def _frame_bytes(layout: Layout | None, rows: int, cols: int, *, itemsize: int, index_itemsize: int) -> int:
+    # Size of the frame built by _to_frame, on top of the arrays it is built from.
+    match layout:
+        case None:
+            return 0
+        case Layout.Wide:
+            return rows * cols * itemsize
+        case Layout.Long:
+            return rows * cols * (np.dtype(np.uint64).itemsize + index_itemsize + itemsize)
+        case _:  # pragma: no cover
+            raise NotImplementedError  # pragma: no cover
@@ -0,0 +1,133 @@
+import itertools
+import multiprocessing
+import os
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+from typing import Self
+
+import numpy as np
+from pyautd3.driver.autd3_device import AUTD3
+from pyautd3.utils import Duration
+
+from pyautd3_emulator.emulator import Emulator
+from pyautd3_emulator.instant import InstantRecordOption
+from pyautd3_emulator.points import Points
+from pyautd3_emulator.range import RangeXYZ
+from pyautd3_emulator.recorder import Recorder
+from pyautd3_emulator.rms import RmsRecordOption
+from pyautd3_emulator.utils import _ULTRASOUND_PERIOD_NS
+
+
+class SharedResult:
+    time: np.ndarray
+    values: np.ndarray
+    _shm: SharedMemory
+
+    def __init__(self: Self, shm: SharedMemory, n: int, points_len: int) -> None:
+        self._shm = shm
+        self.time, self.values = _shared_arrays(shm, n, points_len)
+
+    @property
+    def name(self: Self) -> str:
+        return self._shm.name
+
+    def close(self: Self) -> None:
+        del self.time, self.values
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self: Self) -> Self:
+        return self
+
+    def __exit__(
+        self: Self,
+        _exc_type: type[BaseException] | None,
+        _exc_value: BaseException | None,
+        _traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def _shared_arrays(shm: SharedMemory, n: int, points_len: int) -> tuple[np.ndarray, np.ndarray]:
+    time = np.ndarray((n,), dtype=np.uint64, buffer=shm.buf)
+    values = np.ndarray((n, points_len), dtype=np.float32, buffer=shm.buf, offset=time.nbytes)
+    return time, values
+
+
+def _compute_window(
+    devices: Sequence[AUTD3],
+    f: Callable[[Recorder], None],
+    range_: RangeXYZ | Points,
+    option: InstantRecordOption | RmsRecordOption,
+    *,
+    shm_name: str,
+    shape: tuple[int, int],
+    window: tuple[int, int, int, int],
+) -> None:
+    start_ns, duration_ns, row_start, row_end = window
+    shm = SharedMemory(name=shm_name)
+    try:
+        time, values = _shared_arrays(shm, *shape)
+        with Emulator(devices) as emulator:
+            sound_field = emulator.record(f).sound_field(range_, option)
+            sound_field.skip(Duration.from_nanos(start_ns))
+            sound_field.next_into(Duration.from_nanos(duration_ns), time[row_start:row_end], values[row_start:row_end])
+        del time, values
+    finally:
+        shm.close()
+
+
+def _window_count(periods: int, windows: int | None, max_workers: int | None) -> int:
+    # One window per worker by default, so the pool is not left running a single window serially.
+    return max(1, min(periods, windows or max_workers or os.cpu_count() or 1))
+
+
+def compute_time_sharded(
+    devices: Sequence[AUTD3],
+    f: Callable[[Recorder], None],
+    range_: RangeXYZ | Points,
+    option: InstantRecordOption | RmsRecordOption,
+    duration: Duration,
+    *,
+    skip: Duration | None = None,
+    windows: int | None = None,
+    max_workers: int | None = None,
+) -> SharedResult:
+    # Every worker process re-creates the same Record from devices and f, so f must be picklable (a module-level function).
+    if duration.as_nanos() % _ULTRASOUND_PERIOD_NS != 0:
+        err = "Duration must be multiple of 25µs"
+        raise ValueError(err)
+    skip_ns = skip.as_nanos() if skip is not None else 0
+    step_ns = option._time_step().as_nanos()
+    periods = duration.as_nanos() // _ULTRASOUND_PERIOD_NS
+    rows_per_period = _ULTRASOUND_PERIOD_NS // step_ns
+    n = periods * rows_per_period
+    points_len = range_._points_len()
+
+    bounds = [0, *np.cumsum([len(c) for c in np.array_split(np.arange(periods), _window_count(periods, windows, max_workers))])]
+    jobs = [
+        (
+            skip_ns + int(a) * _ULTRASOUND_PERIOD_NS,
+            int(b - a) * _ULTRASOUND_PERIOD_NS,
+            int(a) * rows_per_period,
+            int(b) * rows_per_period,
+        )
+        for a, b in itertools.pairwise(bounds)
+    ]
+
+    shm = SharedMemory(create=True, size=max(1, n * (np.dtype(np.uint64).itemsize + points_len * np.dtype(np.float32).itemsize)))
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [
+                executor.submit(_compute_window, list(devices), f, range_, option, shm_name=shm.name, shape=(n, points_len), window=job)
+                for job in jobs
+            ]
+            for fut in futures:
+                fut.result()
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    return SharedResult(shm, n, points_len)
@@ -0,0 +1,24 @@
+from typing import Self
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+class Points:
+    _points: np.ndarray
+
+    def __init__(self: Self, points: ArrayLike) -> None:
+        self._points = np.ascontiguousarray(points, dtype=np.float32)
+        if self._points.ndim != 2 or self._points.shape[1] != 3:  # noqa: PLR2004
+            err = "Points must be an array of shape (N, 3)"
+            raise ValueError(err)
+
+    def _points_len(self: Self) -> int:
+        return len(self._points)
+
+    def _coordinates(self: Self) -> np.ndarray:
+        return self._points
+
+    def _split(self: Self, n: int) -> list["Points"]:
+        # Contiguous blocks of the point order, so the shards' columns concatenate back into it.
+        return [Points(p) for p in np.array_split(self._points, min(n, len(self._points)))]
@@ -0,0 +1,141 @@
+import atexit
+import ctypes
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+from types import TracebackType
+from typing import IO, Self
+
+import polars as pl
+
+from pyautd3_emulator.native_methods.autd3capi_emulator import NativeMethods as Emu
+
+_ENV = "PYAUTD3_EMULATOR_PROFILE"
+
+_active: "Profiler | None" = None
+
+
+class Profiler:
+    _stats: dict[str, list[float]]
+    _lock: threading.Lock
+    _dll: ctypes.CDLL | None
+
+    def __init__(self: Self) -> None:
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._dll = None
+
+    def __enter__(self: Self) -> Self:
+        self.start()
+        return self
+
+    def __exit__(
+        self: Self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.stop()
+
+    def start(self: Self) -> None:
+        # The native library is swapped for a timing proxy only while profiling, so nothing is measured or wrapped when off.
+        global _active  # noqa: PLW0603
+        if _active is not None:
+            err = "Another profiler is already running"
+            raise RuntimeError(err)
+        native = Emu()
+        self._dll = native.dll
+        native.dll = _ProfiledDll(native.dll, self)  # type: ignore[bad-assignment]
+        _active = self
+
+    def stop(self: Self) -> None:
+        global _active  # noqa: PLW0603
+        if _active is not self or self._dll is None:
+            return
+        Emu().dll = self._dll
+        self._dll = None
+        _active = None
+
+    def reset(self: Self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def stats(self: Self) -> pl.DataFrame:
+        with self._lock:
+            items = sorted(self._stats.items(), key=lambda e: e[1][1], reverse=True)
+        return pl.DataFrame(
+            {
+                "name": [k for k, _ in items],
+                "calls": [int(v[0]) for _, v in items],
+                "total[s]": [v[1] for _, v in items],
+                "mean[s]": [v[1] / v[0] for _, v in items],
+                "max[s]": [v[2] for _, v in items],
+                "bytes": [int(v[3]) for _, v in items],
+            },
+            schema={"name": pl.String, "calls": pl.UInt64, "total[s]": pl.Float64, "mean[s]": pl.Float64, "max[s]": pl.Float64, "bytes": pl.UInt64},
+        )
+
+    def dump(self: Self, file: IO[str] | None = None) -> None:
+        with pl.Config(tbl_rows=-1, tbl_cols=-1, tbl_width_chars=200, fmt_str_lengths=64):
+            print(self.stats(), file=file or sys.stderr)
+
+    def _record(self: Self, name: str, elapsed: float, nbytes: int) -> None:
+        with self._lock:
+            s = self._stats.setdefault(name, [0, 0.0, 0.0, 0])
+            s[0] += 1
+            s[1] += elapsed
+            s[2] = max(s[2], elapsed)
+            s[3] += nbytes
+
+
+class _ProfiledDll:
+    _dll: object
+    _profiler: Profiler
+    _functions: dict[str, Callable]
+
+    def __init__(self: Self, dll: object, profiler: Profiler) -> None:
+        self._dll = dll
+        self._profiler = profiler
+        self._functions = {}
+
+    def __getattr__(self: Self, name: str) -> Callable:
+        f = self._functions.get(name)
+        if f is None:
+            f = _timed(name, getattr(self._dll, name), self._profiler)
+            self._functions[name] = f
+        return f
+
+
+def _timed(name: str, f: Callable, profiler: Profiler) -> Callable:
+    def call(*args: object) -> object:
+        start = time.perf_counter()
+        try:
+            return f(*args)
+        finally:
+            profiler._record(name, time.perf_counter() - start, sum(_nbytes(a) for a in args))
+
+    return call
+
+
+def _nbytes(arg: object) -> int:
+    # Row pointer tables keep their rows in _values; other numpy-backed pointers keep their array in _arr.
+    for attr in ("_values", "_arr"):
+        v = getattr(arg, attr, None)
+        if v is not None:
+            return v.nbytes
+    return 0
+
+
+def _timed_frame(profiler: Profiler, name: str, f: Callable[[], pl.DataFrame]) -> pl.DataFrame:
+    start = time.perf_counter()
+    df = f()
+    profiler._record(name, time.perf_counter() - start, int(df.estimated_size()))
+    return df
+
+
+if os.environ.get(_ENV, "0") not in ("", "0"):  # pragma: no cover
+    _profiler = Profiler()
+    _profiler.start()
+    atexit.register(_profiler.dump)
@@ -0,0 +1,76 @@
+import threading
+import time
+from collections.abc import Callable, Generator
+from concurrent.futures import CancelledError
+from typing import Self
+
+from pyautd3.utils import Duration
+
+
+class Progress:
+    fraction: float
+    elapsed: float
+    eta: float
+    points_per_second: float
+
+    def __init__(self: Self, fraction: float, elapsed: float, eta: float, points_per_second: float) -> None:
+        self.fraction = fraction
+        self.elapsed = elapsed
+        self.eta = eta
+        self.points_per_second = points_per_second
+
+    def __repr__(self: Self) -> str:
+        return (
+            f"Progress(fraction={self.fraction:.3f}, elapsed={self.elapsed:.3f}s, eta={self.eta:.3f}s, "
+            f"points_per_second={self.points_per_second:.3g})"
+        )
+
+
+class CancellationToken:
+    _event: threading.Event
+
+    def __init__(self: Self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self: Self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self: Self) -> bool:
+        return self._event.is_set()
+
+
+def _chunks(
+    total: Duration,
+    chunk: Duration,
+    values_per_step: int,
+    time_len: Callable[[Duration], int],
+    *,
+    progress: Callable[[Progress], None] | None,
+    cancel: CancellationToken | None,
+) -> Generator[Duration]:
+    # Yields the duration of each chunk. Cancellation is checked before every chunk and progress is reported after each one,
+    # so neither interrupts a native call in flight.
+    start = time.perf_counter()
+    n = max(1, time_len(total))
+    done = 0
+    remaining = total
+    while remaining > Duration.from_nanos(0):
+        if cancel is not None and cancel.cancelled:
+            err = "Computation was cancelled"
+            raise CancelledError(err)
+        duration = min(chunk, remaining)
+        yield duration
+        remaining -= duration
+        if progress is not None:
+            done += time_len(duration)
+            elapsed = time.perf_counter() - start
+            fraction = done / n
+            progress(
+                Progress(
+                    fraction=fraction,
+                    elapsed=elapsed,
+                    eta=elapsed * (1.0 - fraction) / fraction if fraction > 0 else float("inf"),
+                    points_per_second=done * values_per_step / elapsed if elapsed > 0 else float("inf"),
+                ),
+            )
@@ -1,5 +1,7 @@
 from typing import Self
 
+import numpy as np
+
 from pyautd3_emulator.native_methods.autd3capi_emulator import RangeXYZ as RangeXYZ_
 
 
@@ -23,3 +25,48 @@ class RangeXYZ:
             z_end=z[1],
             resolution=resolution,
         )
+
+    def _axes(self: Self) -> dict[str, tuple[np.float32, np.float32]]:
+        inner = self._inner
+        return {
+            "x": (np.float32(inner.x_start), np.float32(inner.x_end)),
+            "y": (np.float32(inner.y_start), np.float32(inner.y_end)),
+            "z": (np.float32(inner.z_start), np.float32(inner.z_end)),
+        }
+
+    def _counts(self: Self) -> dict[str, int]:
+        # Same float32 arithmetic as the native side.
+        res = np.float32(self._inner.resolution)
+        return {k: int(np.floor((e - s) / res)) + 1 if e >= s else 1 for k, (s, e) in self._axes().items()}
+
+    def _points_len(self: Self) -> int:
+        return int(np.prod(list(self._counts().values())))
+
+    def _coordinates(self: Self) -> np.ndarray:
+        res = np.float32(self._inner.resolution)
+        counts = self._counts()
+        x, y, z = (s + np.arange(counts[k], dtype=np.float32) * res for k, (s, _) in self._axes().items())
+        z, y, x = np.meshgrid(z, y, x, indexing="ij")
+        return np.stack([x.ravel(), y.ravel(), z.ravel()], axis=1)
+
+    def _split(self: Self, n: int) -> list["RangeXYZ"]:
+        # Split along the slowest varying axis with more than one point, so that each part is a contiguous block of the
+        # point order (x fastest, then y, then z).
+        res = np.float32(self._inner.resolution)
+        axes = self._axes()
+        counts = self._counts()
+        axis = next((k for k in ("z", "y", "x") if counts[k] > 1), "z")
+        start = axes[axis][0]
+        parts = []
+        for indices in np.array_split(np.arange(counts[axis]), min(n, counts[axis])):
+            bounds = dict(axes)
+            bounds[axis] = (start + np.float32(indices[0]) * res, start + np.float32(indices[-1]) * res + res / np.float32(2))
+            parts.append(
+                RangeXYZ(
+                    x=(float(bounds["x"][0]), float(bounds["x"][1])),
+                    y=(float(bounds["y"][0]), float(bounds["y"][1])),
+                    z=(float(bounds["z"][0]), float(bounds["z"][1])),
+                    resolution=float(res),
+                ),
+            )
+        return parts
@@ -1,22 +1,300 @@
 import ctypes
-from typing import Self
+import json
+from abc import ABCMeta, abstractmethod
+from pathlib import Path
+from typing import Literal, Self
 
 import numpy as np
 import polars as pl
+from numpy.typing import ArrayLike
+from pyautd3.driver.autd3_device import AUTD3
 from pyautd3.native_methods.utils import _validate_ptr
+from pyautd3.utils import Duration
 
+from pyautd3_emulator.adaptive import _adaptive_rms
 from pyautd3_emulator.instant import Instant, InstantRecordOption
+from pyautd3_emulator.layout import Layout, _frame_bytes, _to_frame
 from pyautd3_emulator.native_methods.autd3capi_emulator import NativeMethods as Emu
 from pyautd3_emulator.native_methods.autd3capi_emulator import RecordPtr
+from pyautd3_emulator.points import Points
 from pyautd3_emulator.range import RangeXYZ
+from pyautd3_emulator.reference import Engine, ReferenceInstant, ReferenceRms
 from pyautd3_emulator.rms import Rms, RmsRecordOption
+from pyautd3_emulator.sharded import ShardedSoundField
+from pyautd3_emulator.utils import _OUTPUT_SAMPLES_PER_PERIOD, _ULTRASOUND_PERIOD_NS, _row_pointers, _window
 
+_MAGIC = b"AUTDREC\x00"
+_VERSION = 1
+_ALIGN = 64
+_TABLE_COLUMNS = {
+    "dev_idx": np.uint16,
+    "tr_idx": np.uint8,
+    "x[mm]": np.float32,
+    "y[mm]": np.float32,
+    "z[mm]": np.float32,
+    "nx": np.float32,
+    "ny": np.float32,
+    "nz": np.float32,
+}
 
-class Record:
+type _Drive = Literal["phase", "pulse_width"]
+type _Output = Literal["output_voltage", "output_ultrasound"]
+
+
+def _itemsize(name: str) -> int:
+    match name:
+        case "phase":
+            return np.dtype(np.uint8).itemsize
+        case "pulse_width":
+            return np.dtype(np.uint16).itemsize
+        case "output_voltage" | "output_ultrasound":
+            return np.dtype(np.float32).itemsize
+        case _:
+            err = f"Unknown array: {name}"
+            raise ValueError(err)
+
+
+class _RecordBase(metaclass=ABCMeta):
+    @abstractmethod
+    def transducer_table(self: Self) -> pl.DataFrame: ...
+
+    @abstractmethod
+    def _drive_rows(self: Self) -> int: ...
+
+    @abstractmethod
+    def _drive_cols(self: Self) -> int: ...
+
+    @abstractmethod
+    def _drive_window(self: Self, name: _Drive, start: Duration | None, end: Duration | None) -> tuple[np.ndarray, np.ndarray]: ...
+
+    @abstractmethod
+    def _output_window(self: Self, name: _Output, start: Duration | None, end: Duration | None) -> tuple[np.ndarray, np.ndarray]: ...
+
+    def _reference_sound_field(
+        self: Self,
+        range_: RangeXYZ | Points,
+        option: InstantRecordOption | RmsRecordOption,
+    ) -> ReferenceInstant | ReferenceRms:
+        match option:
+            case InstantRecordOption():
+                return ReferenceInstant(self, range_, option)
+            case RmsRecordOption():
+                return ReferenceRms(self, range_, option)
+            case _:  # pragma: no cover
+                raise NotImplementedError  # pragma: no cover
+
+    def phase_array(
+        self: Self,
+        *,
+        start: Duration | None = None,
+        end: Duration | None = None,
+        devices: ArrayLike | None = None,
+        transducers: ArrayLike | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        time, v = self._drive_window("phase", start, end)
+        return time, self._gather(v, devices, transducers)
+
+    def pulse_width_array(
+        self: Self,
+        *,
+        start: Duration | None = None,
+        end: Duration | None = None,
+        devices: ArrayLike | None = None,
+        transducers: ArrayLike | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        time, v = self._drive_window("pulse_width", start, end)
+        return time, self._gather(v, devices, transducers)
+
+    def output_voltage_array(
+        self: Self,
+        *,
+        start: Duration | None = None,
+        end: Duration | None = None,
+        devices: ArrayLike | None = None,
+        transducers: ArrayLike | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        time, v = self._output_window("output_voltage", start, end)
+        return time, self._gather(v, devices, transducers)
+
+    def output_ultrasound_array(
+        self: Self,
+        *,
+        start: Duration | None = None,
+        end: Duration | None = None,
+        devices: ArrayLike | None = None,
+        transducers: ArrayLike | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        time, v = self._output_window("output_ultrasound", start, end)
+        return time, self._gather(v, devices, transducers)
+
+    def phase(
+        self: Self,
+        *,
+        start: Duration | None = None,
+        end: Duration | None = None,
+        devices: ArrayLike | None = None,
+        transducers: ArrayLike | None = None,
+        layout: Layout = Layout.Wide,
+    ) -> pl.DataFrame:
+        time, v = self.phase_array(start=start, end=end, devices=devices, transducers=transducers)
+        return _to_frame(layout, time, v, name="phase", unit="[ns]", index=self._index(devices, transducers))
+
+    def pulse_width(
+        self: Self,
+        *,
+        start: Duration | None = None,
+        end: Duration | None = None,
+        devices: ArrayLike | None = None,
+        transducers: ArrayLike | None = None,
+        layout: Layout = Layout.Wide,
+    ) -> pl.DataFrame:
+        time, v = self.pulse_width_array(start=start, end=end, devices=devices, transducers=transducers)
+        return _to_frame(layout, time, v, name="pulse_width", unit="[ns]", index=self._index(devices, transducers))
+
+    def output_voltage(
+        self: Self,
+        *,
+        start: Duration | None = None,
+        end: Duration | None = None,
+        devices: ArrayLike | None = None,
+        transducers: ArrayLike | None = None,
+        layout: Layout = Layout.Wide,
+    ) -> pl.DataFrame:
+        time, v = self.output_voltage_array(start=start, end=end, devices=devices, transducers=transducers)
+        return _to_frame(
+            layout,
+            time,
+            v,
+            name="voltage[V]",
+            unit="[25us/512]",
+            index=self._index(devices, transducers),
+            ns_per_step=_ULTRASOUND_PERIOD_NS / _OUTPUT_SAMPLES_PER_PERIOD,
+        )
+
+    def output_ultrasound(
+        self: Self,
+        *,
+        start: Duration | None = None,
+        end: Duration | None = None,
+        devices: ArrayLike | None = None,
+        transducers: ArrayLike | None = None,
+        layout: Layout = Layout.Wide,
+    ) -> pl.DataFrame:
+        time, v = self.output_ultrasound_array(start=start, end=end, devices=devices, transducers=transducers)
+        return _to_frame(
+            layout,
+            time,
+            v,
+            name="p[a.u.]",
+            unit="[25us/512]",
+            index=self._index(devices, transducers),
+            ns_per_step=_ULTRASOUND_PERIOD_NS / _OUTPUT_SAMPLES_PER_PERIOD,
+        )
+
+    def estimate_bytes(
+        self: Self,
+        name: _Drive | _Output,
+        *,
+        start: Duration | None = None,
+        end: Duration | None = None,
+        devices: ArrayLike | None = None,
+        transducers: ArrayLike | None = None,
+        layout: Layout | None = None,
+    ) -> int:
+        # Bytes allocated by {name}_array (without layout) or {name} (with layout) for the given window and selection.
+        n, _ = self._window_len(name, start, end)
+        return self._estimate_bytes(name, n, devices, transducers, layout)
+
+    def plan_chunk(
+        self: Self,
+        name: _Drive | _Output,
+        budget_mb: int,
+        *,
+        devices: ArrayLike | None = None,
+        transducers: ArrayLike | None = None,
+        layout: Layout | None = None,
+    ) -> Duration:
+        # The longest multiple of 25µs whose window fits in the budget, to be read with start/end. At least one period is
+        # always returned. The estimate is linear in the window length plus buffers of fixed size, so both are measured.
+        samples = _OUTPUT_SAMPLES_PER_PERIOD if name in {"output_voltage", "output_ultrasound"} else 1
+        fixed = self._estimate_bytes(name, 0, devices, transducers, layout)
+        per_period = self._estimate_bytes(name, samples, devices, transducers, layout) - fixed
+        periods = (budget_mb * 1024 * 1024 - fixed) // max(1, per_period)
+        periods = min(max(1, periods), max(1, self._drive_cols()))
+        return Duration.from_nanos(periods * _ULTRASOUND_PERIOD_NS)
+
+    def _estimate_bytes(
+        self: Self,
+        name: _Drive | _Output,
+        n: int,
+        devices: ArrayLike | None,
+        transducers: ArrayLike | None,
+        layout: Layout | None,
+    ) -> int:
+        item = _itemsize(name)
+        selected = len(self._selection(devices, transducers))
+        # A subset is gathered from the full-width window, together with its index.
+        gathered = 0 if devices is None and transducers is None else selected * (n * item + np.dtype(np.int64).itemsize)
+        index = np.dtype(np.uint16).itemsize + np.dtype(np.uint8).itemsize
+        return self._window_bytes(name, n) + gathered + _frame_bytes(layout, n, selected, itemsize=item, index_itemsize=index)
+
+    @abstractmethod
+    def _window_bytes(self: Self, name: _Drive | _Output, n: int) -> int: ...
+
+    def _window_len(self: Self, name: _Drive | _Output, start: Duration | None, end: Duration | None) -> tuple[int, int]:
+        item = _itemsize(name)
+        match name:
+            case "phase" | "pulse_width":
+                window = _window(self._drive_cols(), start, end)
+            case _:
+                samples = _OUTPUT_SAMPLES_PER_PERIOD
+                window = _window(self._drive_cols() * samples, start, end, samples_per_period=samples)
+        return window.stop - window.start, item
+
+    def _selection(self: Self, devices: ArrayLike | None, transducers: ArrayLike | None) -> np.ndarray:
+        num_devices = self._drive_rows() // AUTD3.NUM_TRANS_IN_UNIT
+        dev = np.arange(num_devices) if devices is None else np.asarray(devices, dtype=np.int64).ravel()
+        tr = np.arange(AUTD3.NUM_TRANS_IN_UNIT) if transducers is None else np.asarray(transducers, dtype=np.int64).ravel()
+        # Out of range indices would otherwise select a transducer of a neighbouring device.
+        if np.any((dev < 0) | (dev >= num_devices)):
+            err = f"Device index must be in [0, {num_devices})"
+            raise ValueError(err)
+        if np.any((tr < 0) | (tr >= AUTD3.NUM_TRANS_IN_UNIT)):
+            err = f"Transducer index must be in [0, {AUTD3.NUM_TRANS_IN_UNIT})"
+            raise ValueError(err)
+        return (dev[:, np.newaxis] * AUTD3.NUM_TRANS_IN_UNIT + tr[np.newaxis, :]).ravel()
+
+    def _gather(self: Self, v: np.ndarray, devices: ArrayLike | None, transducers: ArrayLike | None) -> np.ndarray:
+        if devices is None and transducers is None:
+            return v
+        # take writes C-contiguous rows directly, where fancy indexing on the second axis needs another copy to get them.
+        return np.take(v, self._selection(devices, transducers), axis=1)
+
+    def _index(self: Self, devices: ArrayLike | None, transducers: ArrayLike | None) -> dict[str, np.ndarray]:
+        idx = self._selection(devices, transducers)
+        return {
+            "dev_idx": (idx // AUTD3.NUM_TRANS_IN_UNIT).astype(np.uint16),
+            "tr_idx": (idx % AUTD3.NUM_TRANS_IN_UNIT).astype(np.uint8),
+        }
+
+
+def _align(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+
+def _map(path: Path, mode: Literal["r", "r+"], dtype: np.dtype, offset: int, shape: tuple[int, ...]) -> np.ndarray:
+    if int(np.prod(shape)) == 0:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, mode=mode, dtype=dtype, offset=offset, shape=shape)
+
+
+class Record(_RecordBase):
     _ptr: RecordPtr
+    _table: pl.DataFrame
 
-    def __init__(self: Self, ptr: RecordPtr) -> None:
+    def __init__(self: Self, ptr: RecordPtr, table: pl.DataFrame) -> None:
         self._ptr = ptr
+        self._table = table
 
     def __del__(self: Self) -> None:
         self._dispose()
@@ -26,83 +304,244 @@ class Record:
             Emu().emulator_record_free(self._ptr)
             self._ptr.value = None
 
-    def phase(self: Self) -> pl.DataFrame:
-        cols = int(Emu().emulator_record_drive_cols(self._ptr))
-        rows = int(Emu().emulator_record_drive_rows(self._ptr))
-        time = np.zeros(cols, dtype=np.uint64)
-        v = np.zeros([cols, rows], dtype=np.uint8)
-        Emu().emulator_record_phase(
-            self._ptr,
-            time.ctypes.data_as(ctypes.POINTER(ctypes.c_uint64)),
-            ctypes.cast(
-                (ctypes.POINTER(ctypes.c_uint8) * cols)(
-                    *(ctypes.cast(r, ctypes.POINTER(ctypes.c_uint8)) for r in np.ctypeslib.as_ctypes(v)),
-                ),
-                ctypes.POINTER(ctypes.POINTER(ctypes.c_uint8)),
-            ),
-        )
-        return pl.DataFrame({s.name: s for s in (pl.Series(name=f"phase@{time[i]}[ns]", values=v[i]) for i in range(cols))})
-
-    def pulse_width(self: Self) -> pl.DataFrame:
-        cols = int(Emu().emulator_record_drive_cols(self._ptr))
-        rows = int(Emu().emulator_record_drive_rows(self._ptr))
-        time = np.zeros(cols, dtype=np.uint64)
-        v = np.zeros([cols, rows], dtype=np.uint16)
-        Emu().emulator_record_pulse_width(
-            self._ptr,
-            time.ctypes.data_as(ctypes.POINTER(ctypes.c_uint64)),
-            ctypes.cast(
-                (ctypes.POINTER(ctypes.c_uint16) * cols)(
-                    *(ctypes.cast(r, ctypes.POINTER(ctypes.c_uint16)) for r in np.ctypeslib.as_ctypes(v)),
-                ),
-                ctypes.POINTER(ctypes.POINTER(ctypes.c_uint16)),
-            ),
-        )
-        return pl.DataFrame({s.name: s for s in (pl.Series(name=f"pulse_width@{time[i]}[ns]", values=v[i]) for i in range(cols))})
-
-    def output_voltage(self: Self) -> pl.DataFrame:
-        cols = int(Emu().emulator_record_output_cols(self._ptr))
-        rows = int(Emu().emulator_record_drive_rows(self._ptr))
-        v = np.zeros([cols, rows], dtype=np.float32)
-        Emu().emulator_record_output_voltage(
-            self._ptr,
-            ctypes.cast(
-                (ctypes.POINTER(ctypes.c_float) * cols)(
-                    *(ctypes.cast(r, ctypes.POINTER(ctypes.c_float)) for r in np.ctypeslib.as_ctypes(v)),
-                ),
-                ctypes.POINTER(ctypes.POINTER(ctypes.c_float)),
-            ),
-        )
-        return pl.DataFrame({s.name: s for s in (pl.Series(name=f"voltage[V]@{i}[25us/512]", values=v[i]) for i in range(cols))})
-
-    def output_ultrasound(self: Self) -> pl.DataFrame:
-        cols = int(Emu().emulator_record_output_cols(self._ptr))
-        rows = int(Emu().emulator_record_drive_rows(self._ptr))
-        v = np.zeros([cols, rows], dtype=np.float32)
-        Emu().emulator_record_output_ultrasound(
-            self._ptr,
-            ctypes.cast(
-                (ctypes.POINTER(ctypes.c_float) * cols)(
-                    *(ctypes.cast(r, ctypes.POINTER(ctypes.c_float)) for r in np.ctypeslib.as_ctypes(v)),
-                ),
-                ctypes.POINTER(ctypes.POINTER(ctypes.c_float)),
-            ),
-        )
-        return pl.DataFrame({s.name: s for s in (pl.Series(name=f"p[a.u.]@{i}[25us/512]", values=v[i]) for i in range(cols))})
+    def transducer_table(self: Self) -> pl.DataFrame:
+        return self._table
+
+    def _drive_rows(self: Self) -> int:
+        return int(Emu().emulator_record_drive_rows(self._ptr))
+
+    def _drive_cols(self: Self) -> int:
+        return int(Emu().emulator_record_drive_cols(self._ptr))
+
+    def _output_cols(self: Self) -> int:
+        return int(Emu().emulator_record_output_cols(self._ptr))
+
+    def _drive_window(self: Self, name: _Drive, start: Duration | None, end: Duration | None) -> tuple[np.ndarray, np.ndarray]:
+        cols = self._drive_cols()
+        window = _window(cols, start, end)
+        time = np.zeros(cols, dtype=np.int64)
+        v = np.zeros([window.stop - window.start, self._drive_rows()], dtype=np.uint8 if name == "phase" else np.uint16)
+        self._drive_into(name, time, v, offset=window.start)
+        return time[window], v
+
+    def _drive_into(self: Self, name: _Drive, time: np.ndarray, v: np.ndarray, *, offset: int = 0) -> None:
+        time_ptr = time.ctypes.data_as(ctypes.POINTER(ctypes.c_uint64))
+        match name:
+            case "phase":
+                Emu().emulator_record_phase(self._ptr, time_ptr, _row_pointers(v, ctypes.c_uint8, offset=offset, total=self._drive_cols()))
+            case "pulse_width":
+                Emu().emulator_record_pulse_width(self._ptr, time_ptr, _row_pointers(v, ctypes.c_uint16, offset=offset, total=self._drive_cols()))
+
+    def _output_window(self: Self, name: _Output, start: Duration | None, end: Duration | None) -> tuple[np.ndarray, np.ndarray]:
+        window = _window(self._output_cols(), start, end, samples_per_period=_OUTPUT_SAMPLES_PER_PERIOD)
+        v = np.zeros([window.stop - window.start, self._drive_rows()], dtype=np.float32)
+        self._output_into(name, v, offset=window.start)
+        return np.arange(window.start, window.stop, dtype=np.int64), v
+
+    def _window_bytes(self: Self, name: _Drive | _Output, n: int) -> int:
+        # The native call fills a time buffer (drive only) and a row pointer table covering the whole record, built from one
+        # temporary of the window length, and the rows outside the window share one scratch row.
+        rows = self._drive_rows()
+        item = _itemsize(name)
+        pointer = np.dtype(np.uintp).itemsize
+        if name in {"phase", "pulse_width"}:
+            total = self._drive_cols()
+            time = total * np.dtype(np.int64).itemsize
+        else:
+            total = self._output_cols()
+            time = n * np.dtype(np.int64).itemsize
+        scratch = 0 if n == total else rows * item
+        return time + n * rows * item + (total + n) * pointer + scratch
+
+    def _output_into(self: Self, name: _Output, v: np.ndarray, *, offset: int = 0) -> None:
+        rows = _row_pointers(v, ctypes.c_float, offset=offset, total=self._output_cols())
+        match name:
+            case "output_voltage":
+                Emu().emulator_record_output_voltage(self._ptr, rows)
+            case "output_ultrasound":
+                Emu().emulator_record_output_ultrasound(self._ptr, rows)
+
+    def save(self: Self, path: str | Path, *, outputs: bool = True) -> None:
+        # The native getters write straight into memory-mapped sections of the file, so saving needs no extra buffers.
+        cols = self._drive_cols()
+        rows = self._drive_rows()
+        shapes: dict[str, tuple[type[np.generic], tuple[int, ...]]] = {
+            "time": (np.int64, (cols,)),
+            "phase": (np.uint8, (cols, rows)),
+            "pulse_width": (np.uint16, (cols, rows)),
+            **{f"table/{k}": (dtype, (rows,)) for k, dtype in _TABLE_COLUMNS.items()},
+        }
+        if outputs:
+            shapes["output_voltage"] = (np.float32, (self._output_cols(), rows))
+            shapes["output_ultrasound"] = (np.float32, (self._output_cols(), rows))
+        sections = {}
+        offsets: dict[str, int] = {}
+        offset = 0
+        for name, (dtype, shape) in shapes.items():
+            offsets[name] = offset
+            sections[name] = {"dtype": np.dtype(dtype).str, "shape": list(shape), "offset": offset}
+            offset = _align(offset + np.dtype(dtype).itemsize * int(np.prod(shape)))
+        header = json.dumps({"version": _VERSION, "sections": sections}).encode()
+        data_offset = _align(len(_MAGIC) + 8 + len(header))
+
+        path = Path(path)
+        with path.open("wb") as fp:
+            fp.write(_MAGIC)
+            fp.write(len(header).to_bytes(8, "little"))
+            fp.write(header)
+            fp.truncate(data_offset + offset)
+
+        def section(name: str) -> np.ndarray:
+            dtype, shape = shapes[name]
+            return _map(path, "r+", np.dtype(dtype), data_offset + offsets[name], shape)
 
-    def sound_field(self: Self, range_: RangeXYZ, option: InstantRecordOption | RmsRecordOption) -> Instant | Rms:
+        for k in _TABLE_COLUMNS:
+            section(f"table/{k}")[:] = self._table[k].to_numpy()
+        time = section("time")
+        self._drive_into("phase", time, section("phase"))
+        self._drive_into("pulse_width", np.empty_like(time), section("pulse_width"))
+        if outputs:
+            self._output_into("output_voltage", section("output_voltage"))
+            self._output_into("output_ultrasound", section("output_ultrasound"))
+
+    @staticmethod
+    def load(path: str | Path) -> "RecordFile":
+        return RecordFile(path)
+
+    def sound_field(
+        self: Self,
+        range_: RangeXYZ | Points,
+        option: InstantRecordOption | RmsRecordOption,
+        *,
+        shards: int = 1,
+        max_workers: int | None = None,
+        engine: Engine = Engine.Native,
+    ) -> Instant | Rms | ShardedSoundField | ReferenceInstant | ReferenceRms:
+        # Points are always evaluated by the NumPy engine, whatever engine is given: the native side only evaluates boxes, and
+        # a native field per point holds buffers of several MB, where the NumPy engine evaluates all points in one vectorized
+        # pass.
+        if isinstance(range_, Points) and range_._points_len() == 0:
+            err = "Points must not be empty"
+            raise ValueError(err)
+        if shards > 1:
+            return ShardedSoundField(
+                [self.sound_field(r, option, engine=engine) for r in range_._split(shards)],
+                max_workers=max_workers,
+            )
+        if engine == Engine.NumPy or isinstance(range_, Points):
+            return self._reference_sound_field(range_, option)
         match option:
             case InstantRecordOption():
                 return Instant(
                     _validate_ptr(
                         Emu().emulator_sound_field_instant(self._ptr, range_._inner, option._inner),
                     ),
+                    option,
+                    self,
                 )
             case RmsRecordOption():  # pragma: no cover
                 return Rms(
                     _validate_ptr(
                         Emu().emulator_sound_field_rms(self._ptr, range_._inner, option._inner),
                     ),
+                    option,
+                    self,
                 )
             case _:  # pragma: no cover
                 raise NotImplementedError  # pragma: no cover
+
+    def adaptive_rms(
+        self: Self,
+        range_: RangeXYZ,
+        resolution: float,
+        *,
+        threshold: float,
+        gradient: float | None = None,
+        duration: Duration | None = None,
+        skip: Duration | None = None,
+        option: RmsRecordOption | None = None,
+        engine: Engine = Engine.Native,
+    ) -> pl.DataFrame:
+        # Starts from the grid of range_ and halves the spacing around points whose RMS (maximum over duration) reaches
+        # threshold [Pa] or whose difference to a neighbour reaches gradient [Pa/mm], down to resolution.
+        option = option or RmsRecordOption()
+        duration = duration or Duration.from_micros(25)
+
+        def evaluate(points: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+            sound_field = self.sound_field(Points(points), option, engine=engine)
+            if skip is not None:
+                sound_field.skip(skip)
+            n = sound_field._time_len(duration)
+            time = np.zeros(n, dtype=np.uint64)
+            v = np.zeros([n, len(points)], dtype=np.float32)
+            sound_field.next_into(duration, time, v)
+            return time, v
+
+        points, res, time, v = _adaptive_rms(evaluate, range_, resolution, threshold=threshold, gradient=gradient)
+        return pl.DataFrame(
+            {
+                "x[mm]": points[:, 0],
+                "y[mm]": points[:, 1],
+                "z[mm]": points[:, 2],
+                "resolution[mm]": res,
+                **{f"rms[Pa]@{t}[ns]": r for t, r in zip(time, v, strict=True)},
+            },
+        )
+
+
+class RecordFile(_RecordBase):
+    path: Path
+    _sections: dict[str, dict]
+    _data_offset: int
+    _cache: dict[str, np.ndarray]
+
+    def __init__(self: Self, path: str | Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as fp:
+            if fp.read(len(_MAGIC)) != _MAGIC:
+                err = f"{self.path} is not a record file"
+                raise ValueError(err)
+            n = int.from_bytes(fp.read(8), "little")
+            header = json.loads(fp.read(n))
+        if header["version"] != _VERSION:
+            err = f"Unsupported record file version: {header['version']}"
+            raise ValueError(err)
+        self._sections = header["sections"]
+        self._data_offset = _align(len(_MAGIC) + 8 + n)
+        self._cache = {}
+
+    def _section(self: Self, name: str) -> np.ndarray:
+        if name not in self._cache:
+            if name not in self._sections:
+                err = f"{name} is not saved in {self.path}"
+                raise ValueError(err)
+            s = self._sections[name]
+            self._cache[name] = _map(self.path, "r", np.dtype(s["dtype"]), self._data_offset + s["offset"], tuple(s["shape"]))
+        return self._cache[name]
+
+    def transducer_table(self: Self) -> pl.DataFrame:
+        return pl.DataFrame({k: np.array(self._section(f"table/{k}")) for k in _TABLE_COLUMNS})
+
+    def sound_field(self: Self, range_: RangeXYZ | Points, option: InstantRecordOption | RmsRecordOption) -> ReferenceInstant | ReferenceRms:
+        # There is no native record behind a file, so sound fields always use the NumPy engine.
+        return self._reference_sound_field(range_, option)
+
+    def _drive_rows(self: Self) -> int:
+        return self._sections["phase"]["shape"][1]
+
+    def _drive_cols(self: Self) -> int:
+        return self._sections["phase"]["shape"][0]
+
+    def _window_bytes(self: Self, name: _Drive | _Output, n: int) -> int:
+        # The window is a view of the mapping, counted as the pages it touches.
+        return n * (np.dtype(np.int64).itemsize + self._drive_rows() * _itemsize(name))
+
+    def _drive_window(self: Self, name: _Drive, start: Duration | None, end: Duration | None) -> tuple[np.ndarray, np.ndarray]:
+        time = self._section("time")
+        window = _window(len(time), start, end)
+        return np.asarray(time[window]), np.asarray(self._section(name)[window])
+
+    def _output_window(self: Self, name: _Output, start: Duration | None, end: Duration | None) -> tuple[np.ndarray, np.ndarray]:
+        v = self._section(name)
+        window = _window(len(v), start, end, samples_per_period=_OUTPUT_SAMPLES_PER_PERIOD)
+        return np.arange(window.start, window.stop, dtype=np.int64), np.asarray(v[window])
@@ -0,0 +1,172 @@
+from enum import Enum
+from typing import TYPE_CHECKING, Self
+
+import numpy as np
+from pyautd3.utils import Duration
+
+from pyautd3_emulator.instant import InstantRecordOption
+from pyautd3_emulator.points import Points
+from pyautd3_emulator.range import RangeXYZ
+from pyautd3_emulator.rms import RmsRecordOption
+from pyautd3_emulator.sound_field import SoundField
+from pyautd3_emulator.utils import _OUTPUT_SAMPLES_PER_PERIOD, _ULTRASOUND_PERIOD_NS
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from pyautd3_emulator.record import _RecordBase
+
+# Both constants are in Pa·mm and were calibrated against the native engine with a single driven transducer.
+_RMS_AMPLITUDE = 3101.3
+_INSTANT_AMPLITUDE = 2.0 * _RMS_AMPLITUDE
+_ULTRASOUND_FREQ = 1e9 / _ULTRASOUND_PERIOD_NS
+_OUTPUT_SAMPLE_NS = _ULTRASOUND_PERIOD_NS / _OUTPUT_SAMPLES_PER_PERIOD
+
+
+class Engine(Enum):
+    Native = 0
+    NumPy = 1
+
+
+class _Reference(SoundField):
+    _record: "_RecordBase"
+    _points: np.ndarray
+    _positions: np.ndarray
+    _sound_speed: float
+    _cursor: int
+
+    def __init__(
+        self: Self,
+        record: "_RecordBase",
+        range_: RangeXYZ | Points,
+        *,
+        time_step: Duration,
+        memory_limits_hint_mb: int,
+        sound_speed: float,
+    ) -> None:
+        super().__init__(time_step, memory_limits_hint_mb)
+        self._record = record
+        self._points = range_._coordinates()
+        table = record.transducer_table()
+        self._positions = np.stack([table[c].to_numpy() for c in ("x[mm]", "y[mm]", "z[mm]")], axis=1)
+        self._sound_speed = sound_speed
+        self._cursor = 0
+
+    def _dispose(self: Self) -> None:
+        pass
+
+    def _points_len(self: Self) -> int:
+        return len(self._points)
+
+    def _time_len(self: Self, duration: Duration) -> int:
+        return duration.as_nanos() // self._time_step.as_nanos()
+
+    def _skip(self: Self, duration: Duration) -> None:
+        self._advance(duration)
+
+    def _get_points(self: Self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> None:
+        x[:] = self._points[:, 0]
+        y[:] = self._points[:, 1]
+        z[:] = self._points[:, 2]
+
+    def _advance(self: Self, duration: Duration) -> int:
+        ns = duration.as_nanos()
+        if ns % _ULTRASOUND_PERIOD_NS != 0:
+            err = "Duration must be multiple of 25µs"
+            raise ValueError(err)
+        if self._cursor + ns > self._record._drive_cols() * _ULTRASOUND_PERIOD_NS:
+            err = "Not recorded"
+            raise ValueError(err)
+        start = self._cursor
+        self._cursor += ns
+        return start
+
+    def _blocks(self: Self, n: int, item_bytes: int) -> "Generator[slice]":
+        # Splits n items so that each block's temporaries stay within the memory limits hint.
+        size = max(1, self._memory_limits_hint_mb * 1024 * 1024 // item_bytes)
+        for start in range(0, n, size):
+            yield slice(start, min(n, start + size))
+
+    def _max_distance(self: Self) -> float:
+        # An upper bound through the transducer centroid, so the full point-transducer matrix is never built.
+        if len(self._points) == 0 or len(self._positions) == 0:
+            return 0.0
+        c = self._positions.mean(axis=0)
+        return float(np.linalg.norm(self._points - c, axis=1).max() + np.linalg.norm(self._positions - c, axis=1).max())
+
+    def _distances(self: Self, points: slice) -> np.ndarray:
+        return np.linalg.norm(self._points[points, np.newaxis, :].astype(np.float64) - self._positions[np.newaxis, :, :], axis=-1)
+
+
+class ReferenceInstant(_Reference):
+    _name = "p[Pa]"
+
+    def __init__(self: Self, record: "_RecordBase", range_: RangeXYZ | Points, option: InstantRecordOption) -> None:
+        super().__init__(
+            record,
+            range_,
+            time_step=option._time_step(),
+            memory_limits_hint_mb=int(option._inner.memory_limits_hint_mb),
+            sound_speed=float(option._inner.sound_speed),
+        )
+
+    def _next_into(self: Self, duration: Duration, time: np.ndarray, v: np.ndarray) -> None:
+        # p(x, t) = A * sum_i u_i(t - r_i / c) / r_i, where u_i is the recorded output ultrasound of transducer i, linearly
+        # interpolated and zero before the record starts.
+        start = self._advance(duration)
+        n = len(time)
+        t = start + np.arange(n, dtype=np.int64) * self._time_step.as_nanos()
+        time[:] = t
+        if n == 0:
+            return
+        trans = len(self._positions)
+        total = self._record._drive_cols() * _OUTPUT_SAMPLES_PER_PERIOD
+        max_delay = self._max_distance() / self._sound_speed * 1e9 / _OUTPUT_SAMPLE_NS
+        lo = max(0, int(np.floor(t[0] / _OUTPUT_SAMPLE_NS - max_delay)) - 1)
+        hi = min(total, int(np.floor(t[-1] / _OUTPUT_SAMPLE_NS)) + 2)
+        _, u = self._record._output_window(
+            "output_ultrasound",
+            Duration.from_nanos(int(lo * _OUTPUT_SAMPLE_NS)),
+            Duration.from_nanos(int(hi * _OUTPUT_SAMPLE_NS)),
+        )
+        u = np.concatenate([u, u[-1:]]).astype(np.float64)
+        tr = np.arange(trans)
+        for points in self._blocks(len(self._points), trans * 64):
+            r = self._distances(points)
+            delay = r / self._sound_speed * 1e9 / _OUTPUT_SAMPLE_NS
+            weight = _INSTANT_AMPLITUDE / r
+            for rows in self._blocks(n, (points.stop - points.start) * trans * 64):
+                s = t[rows, np.newaxis, np.newaxis] / _OUTPUT_SAMPLE_NS - delay[np.newaxis] - lo
+                i0 = np.clip(np.floor(s).astype(np.int64), 0, len(u) - 2)
+                frac = s - i0
+                p = u[i0, tr] * (1.0 - frac) + u[i0 + 1, tr] * frac
+                p[s < -lo] = 0.0
+                v[rows, points] = np.einsum("mbt,bt->mb", p, weight)
+
+
+class ReferenceRms(_Reference):
+    _name = "rms[Pa]"
+
+    def __init__(self: Self, record: "_RecordBase", range_: RangeXYZ | Points, option: RmsRecordOption) -> None:
+        super().__init__(
+            record,
+            range_,
+            time_step=option._time_step(),
+            memory_limits_hint_mb=option.memory_limits_hint_mb,
+            sound_speed=float(option._inner.sound_speed),
+        )
+
+    def _next_into(self: Self, duration: Duration, time: np.ndarray, v: np.ndarray) -> None:
+        # rms(x) = A * |sum_i sin(pi * pw_i / 512) * exp(-i (2 pi phase_i / 256 + k r_i)) / r_i| for each ultrasound period,
+        # without propagation delay or transducer response.
+        start = self._advance(duration)
+        n = len(time)
+        time[:] = start + np.arange(n, dtype=np.int64) * _ULTRASOUND_PERIOD_NS
+        end = Duration.from_nanos(start + duration.as_nanos())
+        _, phase = self._record._drive_window("phase", Duration.from_nanos(start), end)
+        _, pulse_width = self._record._drive_window("pulse_width", Duration.from_nanos(start), end)
+        q = np.sin(np.pi * pulse_width / _OUTPUT_SAMPLES_PER_PERIOD) * np.exp(-2j * np.pi * phase / 256)
+        k = 2.0 * np.pi * _ULTRASOUND_FREQ / self._sound_speed
+        for points in self._blocks(len(self._points), len(self._positions) * 32):
+            r = self._distances(points)
+            v[:, points] = _RMS_AMPLITUDE * np.abs(q @ (np.exp(-1j * k * r) / r).T)
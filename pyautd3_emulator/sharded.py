@@ -0,0 +1,60 @@
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Self
+
+import numpy as np
+from pyautd3.utils import Duration
+
+from pyautd3_emulator.sound_field import SoundField
+
+
+class ShardedSoundField(SoundField):
+    _shards: list[tuple[SoundField, slice]]
+    _executor: ThreadPoolExecutor
+
+    def __init__(self: Self, shards: Sequence[SoundField], *, max_workers: int | None = None) -> None:
+        super().__init__(shards[0]._time_step, shards[0]._memory_limits_hint_mb)
+        self._name = shards[0]._name
+        self._shards = []
+        offset = 0
+        for shard in shards:
+            n = shard._points_len()
+            self._shards.append((shard, slice(offset, offset + n)))
+            offset += n
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or len(shards))
+
+    def __del__(self: Self) -> None:
+        self._dispose()
+
+    def _dispose(self: Self) -> None:
+        self._executor.shutdown(wait=True)
+        for shard, _ in self._shards:
+            shard._dispose()
+
+    @property
+    def shards(self: Self) -> list[SoundField]:
+        return [shard for shard, _ in self._shards]
+
+    def _run(self: Self, f: Callable[[SoundField, slice], None]) -> None:
+        for fut in [self._executor.submit(f, shard, points) for shard, points in self._shards]:
+            fut.result()
+
+    def _points_len(self: Self) -> int:
+        return self._shards[-1][1].stop
+
+    def _time_len(self: Self, duration: Duration) -> int:
+        return self._shards[0][0]._time_len(duration)
+
+    def _skip(self: Self, duration: Duration) -> None:
+        self._run(lambda shard, _: shard._skip(duration))
+
+    def _get_points(self: Self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> None:
+        for shard, points in self._shards:
+            shard._get_points(x[points], y[points], z[points])
+
+    def _next_into(self: Self, duration: Duration, time: np.ndarray, v: np.ndarray) -> None:
+        # Each shard writes straight into its own column block of v; only the first one fills the shared time vector.
+        def next_into(shard: SoundField, points: slice) -> None:
+            shard._next_into(duration, time if points.start == 0 else np.empty_like(time), v[:, points])
+
+        self._run(next_into)
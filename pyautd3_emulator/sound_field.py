@@ -0,0 +1,401 @@
+import asyncio
+import functools
+from abc import ABCMeta, abstractmethod
+from collections.abc import AsyncGenerator, Callable, Generator, Sequence
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Self
+
+import numpy as np
+import polars as pl
+from pyautd3.utils import Duration
+
+from pyautd3_emulator.layout import Layout, _frame_bytes, _to_frame
+from pyautd3_emulator.progress import CancellationToken, Progress, _chunks
+from pyautd3_emulator.store import ChunkStore
+from pyautd3_emulator.utils import _ULTRASOUND_PERIOD_NS
+
+_REDUCERS = ("max", "min", "mean", "rms", "p2p")
+
+
+class SoundField(metaclass=ABCMeta):
+    _name: str
+    _time_step: Duration
+    _memory_limits_hint_mb: int
+    _observe_points: pl.DataFrame | None
+    _grid: tuple[tuple[int, int, int], dict[str, np.ndarray]] | None
+
+    def __init__(self: Self, time_step: Duration, memory_limits_hint_mb: int) -> None:
+        self._time_step = time_step
+        self._memory_limits_hint_mb = memory_limits_hint_mb
+        self._observe_points = None
+        self._grid = None
+
+    @abstractmethod
+    def _dispose(self: Self) -> None: ...
+
+    @abstractmethod
+    def _points_len(self: Self) -> int: ...
+
+    @abstractmethod
+    def _time_len(self: Self, duration: Duration) -> int: ...
+
+    @abstractmethod
+    def _skip(self: Self, duration: Duration) -> None: ...
+
+    @abstractmethod
+    def _get_points(self: Self, x: np.ndarray, y: np.ndarray, z: np.ndarray) -> None: ...
+
+    @abstractmethod
+    def _next_into(self: Self, duration: Duration, time: np.ndarray, v: np.ndarray) -> None: ...
+
+    def skip(self: Self, duration: Duration) -> Self:
+        self._skip(duration)
+        return self
+
+    def observe_points(self: Self) -> pl.DataFrame:
+        if self._observe_points is None:
+            points_len = self._points_len()
+            x = np.zeros(points_len, dtype=np.float32)
+            y = np.zeros(points_len, dtype=np.float32)
+            z = np.zeros(points_len, dtype=np.float32)
+            self._get_points(x, y, z)
+            self._observe_points = pl.DataFrame(
+                {
+                    "x[mm]": x,
+                    "y[mm]": y,
+                    "z[mm]": z,
+                },
+            )
+        return self._observe_points
+
+    @property
+    def grid_shape(self: Self) -> tuple[int, int, int]:
+        return self._grid_layout()[0]
+
+    @property
+    def axes(self: Self) -> dict[str, np.ndarray]:
+        return self._grid_layout()[1]
+
+    def _grid_layout(self: Self) -> tuple[tuple[int, int, int], dict[str, np.ndarray]]:
+        # Points are ordered with x varying fastest, then y, then z, so the axes can be read off the first run of each
+        # coordinate instead of sorting.
+        if self._grid is None:
+            points = self.observe_points()
+            x, y, z = (points[c].to_numpy() for c in ("x[mm]", "y[mm]", "z[mm]"))
+            n = len(x)
+            if n == 0:
+                self._grid = ((0, 0, 0), {"x": x, "y": y, "z": z})
+                return self._grid
+            nx = _first(((y != y[0]) | (z != z[0])), n)
+            nxy = _first(z != z[0], n)
+            ny = nxy // nx
+            nz = n // nxy
+            axes = {"x": x[:nx].copy(), "y": y[:nxy:nx].copy(), "z": z[::nxy].copy()}
+            if (
+                nx * ny * nz != n
+                or not np.array_equal(x, np.tile(axes["x"], ny * nz))
+                or not np.array_equal(y, np.tile(np.repeat(axes["y"], nx), nz))
+                or not np.array_equal(z, np.repeat(axes["z"], nxy))
+            ):
+                err = "Observation points do not form a grid"
+                raise ValueError(err)
+            self._grid = ((nz, ny, nx), axes)
+        return self._grid
+
+    def next(
+        self: Self,
+        duration: Duration,
+        *,
+        layout: Layout = Layout.Wide,
+        chunk: Duration | None = None,
+        progress: Callable[[Progress], None] | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> pl.DataFrame:
+        n = self._time_len(duration)
+        points_len = self._points_len()
+        time = np.zeros(n, dtype=np.uint64)
+        v = np.zeros([n, points_len], dtype=np.float32)
+        self._next_chunked(duration, time, v, chunk=chunk, progress=progress, cancel=cancel)
+        return _to_frame(layout, time, v, name=self._name, unit="[ns]", index={"point_idx": np.arange(points_len, dtype=np.uint32)})
+
+    def next_grid(
+        self: Self,
+        duration: Duration,
+        *,
+        chunk: Duration | None = None,
+        progress: Callable[[Progress], None] | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # The shape is checked first, so a target that is not a grid does not consume the duration.
+        shape = self.grid_shape
+        n = self._time_len(duration)
+        time = np.zeros(n, dtype=np.uint64)
+        v = np.zeros([n, self._points_len()], dtype=np.float32)
+        self._next_chunked(duration, time, v, chunk=chunk, progress=progress, cancel=cancel)
+        return time, v.reshape(n, *shape)
+
+    def _next_chunked(
+        self: Self,
+        duration: Duration,
+        time: np.ndarray,
+        v: np.ndarray,
+        *,
+        chunk: Duration | None,
+        progress: Callable[[Progress], None] | None,
+        cancel: CancellationToken | None,
+    ) -> None:
+        # Without progress or cancellation the whole duration is a single native call. A cancelled computation leaves the
+        # field advanced by the chunks already computed.
+        if chunk is None and progress is None and cancel is None:
+            self._next_into(duration, time, v)
+            return
+        offset = 0
+        for d in _chunks(duration, chunk or self._default_chunk(), self._points_len(), self._time_len, progress=progress, cancel=cancel):
+            n = self._time_len(d)
+            self._next_into(d, time[offset : offset + n], v[offset : offset + n])
+            offset += n
+
+    def next_into(self: Self, duration: Duration, out_time: np.ndarray, out_values: np.ndarray) -> None:
+        n = self._time_len(duration)
+        points_len = self._points_len()
+        if out_time.shape != (n,) or out_time.dtype not in (np.uint64, np.int64):
+            err = f"out_time must be a 1-dimensional uint64 array of length {n}"
+            raise ValueError(err)
+        if out_values.shape != (n, points_len) or out_values.dtype != np.float32:
+            err = f"out_values must be a float32 array of shape ({n}, {points_len})"
+            raise ValueError(err)
+        for name, out in (("out_time", out_time), ("out_values", out_values)):
+            if not out.flags.c_contiguous or not out.flags.writeable:
+                err = f"{name} must be C-contiguous and writeable"
+                raise ValueError(err)
+        self._next_into(duration, out_time, out_values)
+
+    def iter_chunks(
+        self: Self,
+        total: Duration,
+        chunk: Duration | None = None,
+        *,
+        progress: Callable[[Progress], None] | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> Generator[tuple[np.ndarray, np.ndarray]]:
+        # The yielded arrays are views of a single buffer that is overwritten by the next chunk.
+        chunk = chunk or self._default_chunk()
+        points_len = self._points_len()
+        n = self._time_len(min(chunk, total))
+        time = np.zeros(n, dtype=np.uint64)
+        v = np.zeros([n, points_len], dtype=np.float32)
+        for duration in _chunks(total, chunk, points_len, self._time_len, progress=progress, cancel=cancel):
+            n = self._time_len(duration)
+            self._next_into(duration, time[:n], v[:n])
+            yield time[:n], v[:n]
+
+    def reduce(
+        self: Self,
+        total: Duration,
+        reducers: Sequence[str],
+        chunk: Duration | None = None,
+        *,
+        progress: Callable[[Progress], None] | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> pl.DataFrame:
+        # Only the running extrema and sums per point are kept between chunks.
+        for r in reducers:
+            if r not in _REDUCERS:
+                err = f"Unknown reducer: {r}"
+                raise ValueError(err)
+        points_len = self._points_len()
+        v_max = np.full(points_len, -np.inf, dtype=np.float32)
+        v_min = np.full(points_len, np.inf, dtype=np.float32)
+        v_sum = np.zeros(points_len, dtype=np.float64)
+        v_sum_sq = np.zeros(points_len, dtype=np.float64)
+        count = 0
+        for _, v in self.iter_chunks(total, chunk, progress=progress, cancel=cancel):
+            np.maximum(v_max, v.max(axis=0, initial=-np.inf), out=v_max)
+            np.minimum(v_min, v.min(axis=0, initial=np.inf), out=v_min)
+            v_sum += v.sum(axis=0, dtype=np.float64)
+            v_sum_sq += np.einsum("ij,ij->j", v, v, dtype=np.float64)
+            count += len(v)
+        if count == 0:
+            err = "Duration must contain at least one time step"
+            raise ValueError(err)
+        result = {
+            "max": v_max,
+            "min": v_min,
+            "mean": (v_sum / count).astype(np.float32),
+            "rms": np.sqrt(v_sum_sq / count).astype(np.float32),
+            "p2p": v_max - v_min,
+        }
+        return pl.DataFrame({r: result[r] for r in reducers})
+
+    def peaks(
+        self: Self,
+        total: Duration,
+        *,
+        k: int = 1,
+        chunk: Duration | None = None,
+        progress: Callable[[Progress], None] | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> pl.DataFrame:
+        # One row per time step and rank, with rank 0 being the maximum; only the selected indices of each chunk are kept.
+        if k < 1:
+            err = "k must be positive"
+            raise ValueError(err)
+        k = min(k, self._points_len())
+        times = []
+        indices = []
+        values = []
+        for time, v in self.iter_chunks(total, chunk, progress=progress, cancel=cancel):
+            if k == 1:
+                idx = v.argmax(axis=1)[:, np.newaxis]
+            else:
+                idx = np.argpartition(v, -k, axis=1)[:, -k:]
+                idx = np.take_along_axis(idx, np.argsort(-np.take_along_axis(v, idx, axis=1), axis=1, kind="stable"), axis=1)
+            times.append(np.repeat(time, k))
+            indices.append(idx.ravel())
+            values.append(np.take_along_axis(v, idx, axis=1).ravel())
+        idx = np.concatenate([np.zeros(0, dtype=np.int64), *indices])
+        points = self.observe_points()[idx]
+        return pl.DataFrame(
+            {
+                "time[ns]": np.concatenate([np.zeros(0, dtype=np.uint64), *times]),
+                "rank": np.tile(np.arange(k, dtype=np.uint32), len(idx) // k),
+                "point_idx": idx.astype(np.uint32),
+                "x[mm]": points["x[mm]"],
+                "y[mm]": points["y[mm]"],
+                "z[mm]": points["z[mm]"],
+                self._name: np.concatenate([np.zeros(0, dtype=np.float32), *values]),
+            },
+        )
+
+    def welch(
+        self: Self,
+        total: Duration,
+        segment: int,
+        *,
+        overlap: int | None = None,
+        chunk: Duration | None = None,
+        progress: Callable[[Progress], None] | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # One-sided power spectral density in Pa^2/Hz of shape (n_freq, n_points), averaged over Hann-windowed segments with the
+        # mean removed. Only the tail of the previous chunk that overlaps the next segment is carried over.
+        overlap = segment // 2 if overlap is None else overlap
+        if segment < 1 or not 0 <= overlap < segment:
+            err = "segment must be positive and overlap must be in [0, segment)"
+            raise ValueError(err)
+        step = segment - overlap
+        fs = 1e9 / self._time_step.as_nanos()
+        window = np.hanning(segment + 1)[:-1] if segment > 1 else np.ones(1)
+        scale = 1.0 / (fs * np.sum(window**2))
+        psd = np.zeros([segment // 2 + 1, self._points_len()], dtype=np.float64)
+        count = 0
+        tail = np.zeros([0, self._points_len()], dtype=np.float32)
+        for _, v in self.iter_chunks(total, chunk, progress=progress, cancel=cancel):
+            buf = np.concatenate([tail, v])
+            start = 0
+            while start + segment <= len(buf):
+                x = buf[start : start + segment].astype(np.float64)
+                x -= x.mean(axis=0)
+                psd += np.abs(np.fft.rfft(x * window[:, np.newaxis], axis=0)) ** 2
+                count += 1
+                start += step
+            tail = buf[start:]
+        if count == 0:
+            err = "Duration is shorter than one segment"
+            raise ValueError(err)
+        psd *= scale / count
+        psd[1 : (segment + 1) // 2] *= 2.0
+        return np.fft.rfftfreq(segment, 1.0 / fs), psd
+
+    def estimate_bytes(self: Self, duration: Duration, *, layout: Layout | None = None) -> int:
+        # Bytes allocated by next (with layout) or next_into-style buffers (without layout) for the given duration.
+        n = self._time_len(duration)
+        points_len = self._points_len()
+        item = np.dtype(np.float32).itemsize
+        return n * (np.dtype(np.uint64).itemsize + points_len * item) + _frame_bytes(
+            layout,
+            n,
+            points_len,
+            itemsize=item,
+            index_itemsize=np.dtype(np.uint32).itemsize,
+        )
+
+    def plan_chunk(self: Self, budget_mb: int | None = None, *, layout: Layout | None = None) -> Duration:
+        # The longest multiple of 25µs whose buffers fit in the budget, which defaults to memory_limits_hint_mb. At least one
+        # period is always returned.
+        budget = (self._memory_limits_hint_mb if budget_mb is None else budget_mb) * 1024 * 1024
+        period = self.estimate_bytes(Duration.from_nanos(_ULTRASOUND_PERIOD_NS), layout=layout)
+        periods = max(1, budget // max(1, period))
+        return Duration.from_nanos(periods * _ULTRASOUND_PERIOD_NS)
+
+    def to_store(
+        self: Self,
+        path: str | Path,
+        total: Duration,
+        chunk: Duration | None = None,
+        *,
+        progress: Callable[[Progress], None] | None = None,
+        cancel: CancellationToken | None = None,
+    ) -> ChunkStore:
+        # Only one chunk is held in memory at a time; each one is written to its own .npy file.
+        return ChunkStore._write(self, Path(path), self.iter_chunks(total, chunk, progress=progress, cancel=cancel))
+
+    async def anext(
+        self: Self,
+        duration: Duration,
+        *,
+        layout: Layout = Layout.Wide,
+        executor: Executor | None = None,
+        chunk: Duration | None = None,
+        progress: Callable[[Progress], None] | None = None,
+    ) -> pl.DataFrame:
+        # Cancelling the awaiting task stops the computation at the next chunk boundary; the chunk in flight is awaited so
+        # that no native call on this field outlives the task. The field is left advanced by the chunks already computed.
+        cancel = CancellationToken()
+        fut = asyncio.get_running_loop().run_in_executor(
+            executor,
+            functools.partial(self.next, duration, layout=layout, chunk=chunk, progress=progress, cancel=cancel),
+        )
+        try:
+            return await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            cancel.cancel()
+            await asyncio.wait([fut])
+            raise
+
+    async def aiter_chunks(
+        self: Self,
+        total: Duration,
+        chunk: Duration | None = None,
+        *,
+        executor: Executor | None = None,
+    ) -> AsyncGenerator[tuple[np.ndarray, np.ndarray]]:
+        loop = asyncio.get_running_loop()
+        chunks = self.iter_chunks(total, chunk)
+        try:
+            while True:
+                fut = loop.run_in_executor(executor, _next_chunk, chunks)
+                try:
+                    item = await asyncio.shield(fut)
+                except asyncio.CancelledError:
+                    # Let the chunk in flight finish before closing the generator running on the executor.
+                    await asyncio.wait([fut])
+                    raise
+                if item is None:
+                    return
+                yield item
+        finally:
+            chunks.close()
+
+    def _default_chunk(self: Self) -> Duration:
+        return self.plan_chunk()
+
+
+def _next_chunk(chunks: Generator[tuple[np.ndarray, np.ndarray]]) -> tuple[np.ndarray, np.ndarray] | None:
+    return next(chunks, None)
+
+
+def _first(mask: np.ndarray, default: int) -> int:
+    idx = np.flatnonzero(mask)
+    return int(idx[0]) if len(idx) > 0 else default
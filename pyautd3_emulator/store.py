@@ -0,0 +1,131 @@
+import json
+from collections.abc import Callable, Generator, Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+import numpy as np
+from pyautd3.utils import Duration
+
+if TYPE_CHECKING:
+    from pyautd3_emulator.sound_field import SoundField
+
+_INDEX = "index.json"
+_POINTS = "points.npy"
+
+
+class ChunkStore:
+    path: Path
+    _index: dict
+
+    def __init__(self: Self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._index = json.loads((self.path / _INDEX).read_text(encoding="utf-8"))
+
+    @classmethod
+    def open(cls: type["ChunkStore"], path: str | Path) -> "ChunkStore":
+        return cls(path)
+
+    @staticmethod
+    def _write(sound_field: "SoundField", path: Path, chunks: Iterable[tuple[np.ndarray, np.ndarray]]) -> "ChunkStore":
+        path.mkdir(parents=True, exist_ok=True)
+        points = sound_field.observe_points().to_numpy()
+        np.save(path / _POINTS, points)
+        try:
+            shape, axes = sound_field._grid_layout()
+        except ValueError:
+            shape, axes = None, {k: np.unique(points[:, i]) for i, k in enumerate(("x", "y", "z"))}
+        entries = []
+        for i, (time, v) in enumerate(chunks):
+            file = f"chunk_{i:06d}.npy"
+            np.save(path / file, v)
+            entries.append({"file": file, "time_start": int(time[0]), "rows": len(time)})
+        index = {
+            "name": sound_field._name,
+            "time_step": sound_field._time_step.as_nanos(),
+            "points_len": len(points),
+            "axes": {k: a.tolist() for k, a in axes.items()},
+            "shape": None if shape is None else list(shape),
+            "chunks": entries,
+        }
+        (path / _INDEX).write_text(json.dumps(index), encoding="utf-8")
+        return ChunkStore(path)
+
+    @property
+    def name(self: Self) -> str:
+        return self._index["name"]
+
+    @property
+    def shape(self: Self) -> tuple[int, int, int] | None:
+        shape = self._index["shape"]
+        return None if shape is None else tuple(shape)
+
+    @property
+    def axes(self: Self) -> dict[str, np.ndarray]:
+        return {k: np.asarray(a, dtype=np.float32) for k, a in self._index["axes"].items()}
+
+    @property
+    def points(self: Self) -> np.ndarray:
+        return np.load(self.path / _POINTS, mmap_mode="r")
+
+    @property
+    def time(self: Self) -> np.ndarray:
+        return np.concatenate([np.zeros(0, dtype=np.uint64), *(self._chunk_time(c) for c in self._index["chunks"])])
+
+    def chunks(self: Self) -> Generator[tuple[np.ndarray, np.ndarray]]:
+        for c in self._index["chunks"]:
+            yield self._chunk_time(c), np.load(self.path / c["file"], mmap_mode="r")
+
+    def read(
+        self: Self,
+        start: Duration | None = None,
+        end: Duration | None = None,
+        *,
+        x: tuple[float, float] | None = None,
+        y: tuple[float, float] | None = None,
+        z: tuple[float, float] | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Returns values of shape (n_time, nz, ny, nx) for grid stores and (n_time, n_points) otherwise. When the time range lies
+        # within a single chunk and the sub-box is a grid slice, the values are a view of the memory-mapped chunk.
+        lo = 0 if start is None else start.as_nanos()
+        hi = np.iinfo(np.int64).max if end is None else end.as_nanos()
+        select = self._spatial_selection(x, y, z)
+        times = []
+        values = []
+        for time, v in self.chunks():
+            rows = slice(int(np.searchsorted(time, lo, "left")), int(np.searchsorted(time, hi, "left")))
+            if rows.start == rows.stop:
+                continue
+            times.append(time[rows])
+            values.append(select(v[rows]))
+        if not values:
+            return np.zeros(0, dtype=np.uint64), select(np.zeros([0, self._index["points_len"]], dtype=np.float32))
+        if len(values) == 1:
+            return times[0], values[0]
+        return np.concatenate(times), np.concatenate(values)
+
+    def _chunk_time(self: Self, c: dict) -> np.ndarray:
+        return np.uint64(c["time_start"]) + np.arange(c["rows"], dtype=np.uint64) * np.uint64(self._index["time_step"])
+
+    def _spatial_selection(
+        self: Self,
+        x: tuple[float, float] | None,
+        y: tuple[float, float] | None,
+        z: tuple[float, float] | None,
+    ) -> Callable[[np.ndarray], np.ndarray]:
+        bounds = {"x": x, "y": y, "z": z}
+        shape = self.shape
+        if shape is not None:
+            axes = self.axes
+            slices = {}
+            for k, b in bounds.items():
+                a = axes[k]
+                slices[k] = slice(None) if b is None else slice(int(np.searchsorted(a, b[0], "left")), int(np.searchsorted(a, b[1], "right")))
+            return lambda v: v.reshape(v.shape[0], *shape)[:, slices["z"], slices["y"], slices["x"]]
+        points = self.points
+        mask = np.ones(len(points), dtype=bool)
+        for i, b in enumerate(bounds.values()):
+            if b is not None:
+                mask &= (b[0] <= points[:, i]) & (points[:, i] <= b[1])
+        if mask.all():
+            return lambda v: v
+        return lambda v: v[:, mask]
@@ -0,0 +1,47 @@
+import ctypes
+
+import numpy as np
+from pyautd3.utils import Duration
+
+_ULTRASOUND_PERIOD_NS = 25_000
+_OUTPUT_SAMPLES_PER_PERIOD = 512
+
+
+def _row_pointers[T: ctypes._SimpleCData](
+    v: np.ndarray,
+    ty: type[T],
+    *,
+    offset: int = 0,
+    total: int | None = None,
+) -> "ctypes._Pointer[ctypes._Pointer[T]]":
+    # Rows of the table outside [offset, offset + len(v)) all point to a single scratch row, so the native side can write
+    # every row while only the requested ones are kept.
+    if v.ndim != 2 or (v.size > 0 and v.strides[1] != v.itemsize):  # noqa: PLR2004
+        err = "Rows must be C-contiguous"
+        raise ValueError(err)
+    n = v.shape[0]
+    total = n if total is None else total
+    rows = np.empty(total, dtype=np.uintp)
+    # Built in place, so the addresses cost a single temporary of the window length.
+    addresses = np.arange(n, dtype=np.uintp)
+    addresses *= np.uintp(v.strides[0])
+    addresses += np.uintp(v.ctypes.data)
+    rows[offset : offset + n] = addresses
+    scratch = None
+    if total != n:
+        scratch = np.empty(v.shape[1], dtype=v.dtype)
+        rows[:offset] = scratch.ctypes.data
+        rows[offset + n :] = scratch.ctypes.data
+    ptr = rows.ctypes.data_as(ctypes.POINTER(ctypes.POINTER(ty)))
+    ptr._scratch = scratch  # type: ignore[attr-defined]
+    ptr._values = v  # type: ignore[attr-defined]
+    return ptr
+
+
+def _window(cols: int, start: Duration | None, end: Duration | None, *, samples_per_period: int = 1) -> slice:
+    def index(t: Duration) -> int:
+        return min(cols, max(0, -(-t.as_nanos() * samples_per_period // _ULTRASOUND_PERIOD_NS)))
+
+    lo = 0 if start is None else index(start)
+    hi = cols if end is None else index(end)
+    return slice(lo, max(lo, hi))
@@ -1,20 +1,104 @@
+import asyncio
+import functools
+import gc
+import io
+import os
+import time
+import tracemalloc
+from collections.abc import Callable
+from concurrent.futures import CancelledError
+from pathlib import Path
+
 import numpy as np
+import polars as pl
 import pytest
-from pyautd3 import AUTD3
+from pyautd3 import AUTD3, Hz
 from pyautd3.autd_error import AUTDError
 from pyautd3.driver.datagram.silencer import FixedCompletionTime, Silencer
 from pyautd3.driver.firmware.fpga.emit_intensity import Intensity
 from pyautd3.driver.firmware.fpga.phase import Phase
-from pyautd3.gain import Uniform
+from pyautd3.driver.geometry.geometry import Geometry
+from pyautd3.gain import Focus, Uniform
+from pyautd3.gain.focus import FocusOption
+from pyautd3.modulation import Sine
+from pyautd3.modulation.sine import SineOption
 from pyautd3.utils import Duration
 
-from pyautd3_emulator import Emulator, InstantRecordOption, RangeXYZ, Recorder, RmsRecordOption
+from pyautd3_emulator import (
+    Cache,
+    CancellationToken,
+    ChunkStore,
+    Emulator,
+    Engine,
+    InstantRecordOption,
+    Layout,
+    Points,
+    Profiler,
+    Progress,
+    RangeXYZ,
+    Recorder,
+    RmsRecordOption,
+    compute_time_sharded,
+)
+from pyautd3_emulator.native_methods.autd3capi_emulator import NativeMethods
+from pyautd3_emulator.parallel import _window_count
+from pyautd3_emulator.record import Record
+from pyautd3_emulator.reference import ReferenceInstant, ReferenceRms
+from pyautd3_emulator.sharded import ShardedSoundField
+from pyautd3_emulator.sound_field import SoundField
+
+
+def record_focus_at(x: float, autd: Recorder) -> None:
+    autd.send(Focus(pos=[x, 70.0, 150.0], option=FocusOption()))
+    autd.tick(Duration.from_micros(25 * 4))
+
+
+def phase_of(record: Record) -> np.ndarray:
+    return record.phase_array()[1]
+
+
+def record_uniform(autd: Recorder) -> None:
+    autd.send(Uniform(intensity=Intensity(0xFF), phase=Phase(0x40)))
+    autd.tick(Duration.from_micros(25 * 10))
 
 
 def create_emulator() -> Emulator:
     return Emulator([AUTD3(pos=[0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0]), AUTD3(pos=[0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0])])
 
 
+def test_emulator_from_arrays():
+    pos = np.array([[0.0, 0.0, 0.0], [192.0, 0.0, 0.0], [0.0, 151.4, 10.0]])
+    rot = np.array([[1.0, 0.0, 0.0, 0.0], [0.0, 0.0, 0.0, 1.0], [np.sqrt(0.5), np.sqrt(0.5), 0.0, 0.0]])
+    with Emulator([AUTD3(pos=p, rot=r) for p, r in zip(pos, rot, strict=True)]) as expect, Emulator.from_arrays(pos, rot) as emulator:
+        assert emulator.num_devices() == 3
+        assert emulator.transducer_table().equals(expect.transducer_table())
+        assert np.array_equal(emulator.center(), expect.center())
+        assert emulator._lazy_devices is None
+        assert [d.idx() for d in emulator] == [0, 1, 2]
+        assert np.array_equal(emulator[2][248].position(), expect[2][248].position())
+        assert emulator._devices is emulator._devices
+        # Emulator._new replaces Geometry.__init__, so it must keep setting exactly the same state.
+        assert set(vars(Geometry(emulator._geometry_ptr))) == {"_geometry_ptr", "_devices"}
+
+        offset = np.array([0.0, 0.0, 5.0])
+        emulator.reconfigure(lambda d: AUTD3(pos=pos[d.idx()] + offset, rot=rot[(d.idx() + 1) % 3]))
+        assert emulator._lazy_devices is None
+        assert np.array_equal(emulator._pos, (pos + offset).astype(np.float32))
+        assert np.array_equal(emulator._rot, np.roll(rot, -1, axis=0).astype(np.float32))
+        with Emulator.from_arrays(emulator._pos, emulator._rot) as moved:
+            assert emulator.transducer_table().equals(moved.transducer_table())
+            assert np.array_equal(emulator[2][248].position(), moved[2][248].position())
+            assert np.array_equal(emulator[0].rotation(), moved[0].rotation())
+
+    with Emulator.from_arrays(np.zeros((0, 3)), np.zeros((0, 4))) as emulator:
+        assert emulator.num_devices() == 0
+
+    with pytest.raises(ValueError, match=r"pos must be an array of shape \(N, 3\)"):
+        Emulator.from_arrays(np.zeros((2, 2)), np.zeros((2, 4)))
+    with pytest.raises(ValueError, match=r"rot must be an array of shape \(2, 4\)"):
+        Emulator.from_arrays(np.zeros((2, 3)), np.zeros((3, 4)))
+
+
 def test_transducer_table():
     with create_emulator() as emulator:
         table = emulator.transducer_table()
@@ -1134,6 +1218,535 @@ def test_record_output_ultrasound():
                 assert v == expect[i]
 
 
+def test_record_array():
+    with create_emulator() as emulator:
+
+        def f(autd: Recorder) -> None:
+            autd.send(
+                Silencer(
+                    config=FixedCompletionTime(intensity=Duration.from_micros(50), phase=Duration.from_micros(50)),
+                ),
+            )
+            autd.send(Uniform(intensity=Intensity(0xFF), phase=Phase(0x40)))
+            autd.tick(Duration.from_micros(50))
+
+        record = emulator.record(f)
+
+        time, phase = record.phase_array()
+        assert time.dtype == np.int64
+        assert np.array_equal(time, np.array([0, 25000]))
+        assert phase.dtype == np.uint8
+        assert phase.shape == (2, 249 * 2)
+        assert phase.flags.c_contiguous
+        assert np.array_equal(phase, np.repeat(np.array([[32], [64]], np.uint8), 249 * 2, axis=1))
+
+        time, pulse_width = record.pulse_width_array()
+        assert np.array_equal(time, np.array([0, 25000]))
+        assert pulse_width.dtype == np.uint16
+        assert np.array_equal(pulse_width, np.repeat(np.array([[85], [256]], np.uint16), 249 * 2, axis=1))
+
+        time, voltage = record.output_voltage_array()
+        assert np.array_equal(time, np.arange(512 * 2))
+        assert voltage.dtype == np.float32
+        assert voltage.shape == (512 * 2, 249 * 2)
+        assert np.array_equal(voltage, record.output_voltage().to_numpy().T)
+
+        time, ultrasound = record.output_ultrasound_array()
+        assert np.array_equal(time, np.arange(512 * 2))
+        assert np.array_equal(ultrasound, record.output_ultrasound().to_numpy().T)
+
+
+def test_record_long_layout():
+    with create_emulator() as emulator:
+
+        def f(autd: Recorder) -> None:
+            autd.send(Uniform(intensity=Intensity(0xFF), phase=Phase(0x40)))
+            autd.tick(Duration.from_micros(50))
+
+        record = emulator.record(f)
+
+        phase = record.phase(layout=Layout.Long)
+        assert phase.columns == ["time[ns]", "dev_idx", "tr_idx", "phase"]
+        assert phase.height == 2 * 249 * 2
+        assert np.array_equal(phase["time[ns]"].to_numpy(), np.repeat([0, 25000], 249 * 2))
+        assert np.array_equal(phase["dev_idx"].to_numpy(), np.tile(np.repeat(np.arange(2, dtype=np.uint16), 249), 2))
+        assert np.array_equal(phase["tr_idx"].to_numpy(), np.tile(np.arange(249, dtype=np.uint8), 2 * 2))
+        assert np.array_equal(phase["phase"].to_numpy(), record.phase_array()[1].ravel())
+
+        pulse_width = record.pulse_width(layout=Layout.Long)
+        assert pulse_width.columns == ["time[ns]", "dev_idx", "tr_idx", "pulse_width"]
+        assert np.array_equal(pulse_width["pulse_width"].to_numpy(), record.pulse_width_array()[1].ravel())
+
+        voltage = record.output_voltage(layout=Layout.Long)
+        assert voltage.columns == ["time[ns]", "dev_idx", "tr_idx", "voltage[V]"]
+        assert voltage["time[ns]"].dtype == pl.Float64
+        assert np.array_equal(voltage["time[ns]"].to_numpy(), np.repeat(np.arange(512 * 2) * 25000 / 512, 249 * 2))
+        assert np.array_equal(voltage["voltage[V]"].to_numpy(), record.output_voltage_array()[1].ravel())
+
+        ultrasound = record.output_ultrasound(layout=Layout.Long)
+        assert ultrasound.columns == ["time[ns]", "dev_idx", "tr_idx", "p[a.u.]"]
+        assert np.array_equal(ultrasound["p[a.u.]"].to_numpy(), record.output_ultrasound_array()[1].ravel())
+
+
+def test_record_slice():
+    with create_emulator() as emulator:
+
+        def f(autd: Recorder) -> None:
+            autd.send(Silencer())
+            autd.send(Uniform(intensity=Intensity(0xFF), phase=Phase(0x40)))
+            autd.tick(Duration.from_micros(25 * 4))
+
+        record = emulator.record(f)
+
+        time, phase = record.phase_array()
+        t, v = record.phase_array(start=Duration.from_micros(25), end=Duration.from_micros(75))
+        assert np.array_equal(t, time[1:3])
+        assert np.array_equal(v, phase[1:3])
+        t, v = record.phase_array(start=Duration.from_micros(30), devices=[1], transducers=[0, 5])
+        assert np.array_equal(t, time[2:])
+        assert v.flags.c_contiguous
+        assert np.array_equal(v, phase[2:][:, [249, 254]])
+        t, v = record.phase_array(start=Duration.from_micros(100))
+        assert t.shape == (0,)
+        assert v.shape == (0, 249 * 2)
+
+        time, pulse_width = record.pulse_width_array()
+        t, v = record.pulse_width_array(end=Duration.from_micros(50), transducers=[3])
+        assert np.array_equal(t, time[:2])
+        assert np.array_equal(v, pulse_width[:2][:, [3, 249 + 3]])
+
+        time, voltage = record.output_voltage_array()
+        t, v = record.output_voltage_array(start=Duration.from_micros(25), end=Duration.from_micros(50), devices=[1])
+        assert np.array_equal(t, time[512:1024])
+        assert np.array_equal(v, voltage[512:1024, 249:])
+
+        time, ultrasound = record.output_ultrasound_array()
+        t, v = record.output_ultrasound_array(start=Duration.from_nanos(50), end=Duration.from_nanos(100))
+        assert np.array_equal(t, np.array([2]))
+        assert np.array_equal(v, ultrasound[2:3])
+
+        df = record.phase(start=Duration.from_micros(25), devices=[1], transducers=[0, 5], layout=Layout.Long)
+        assert np.array_equal(df["time[ns]"].to_numpy(), np.repeat([25000, 50000, 75000], 2))
+        assert np.array_equal(df["dev_idx"].to_numpy(), np.ones(3 * 2, np.uint16))
+        assert np.array_equal(df["tr_idx"].to_numpy(), np.tile(np.array([0, 5], np.uint8), 3))
+        df = record.pulse_width(end=Duration.from_micros(25), transducers=[0])
+        assert df.columns == ["pulse_width@0[ns]"]
+        assert np.array_equal(df["pulse_width@0[ns]"].to_numpy(), pulse_width[0, [0, 249]])
+
+        with pytest.raises(ValueError, match=r"Transducer index must be in \[0, 249\)"):
+            record.phase_array(devices=[0], transducers=[249])
+        with pytest.raises(ValueError, match=r"Transducer index must be in \[0, 249\)"):
+            record.phase_array(transducers=[-1])
+        with pytest.raises(ValueError, match=r"Device index must be in \[0, 2\)"):
+            record.output_voltage_array(devices=[2])
+        with pytest.raises(ValueError, match=r"Device index must be in \[0, 2\)"):
+            record.pulse_width(devices=[-1], layout=Layout.Long)
+
+
+@pytest.mark.parametrize("option", [InstantRecordOption(), RmsRecordOption()])
+def test_sound_field_long_layout(option: InstantRecordOption | RmsRecordOption):
+    with Emulator([AUTD3(pos=[0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0])]) as emulator:
+
+        def f(autd: Recorder) -> None:
+            autd.send(Uniform(intensity=Intensity(0xFF), phase=Phase(0x40)))
+            autd.tick(Duration.from_micros(25 * 10))
+
+        record = emulator.record(f)
+        range_ = RangeXYZ(x=(-1.0, 1.0), y=(0.0, 0.0), z=(10.0, 10.0), resolution=1.0)
+
+        wide = record.sound_field(range_, option).skip(Duration.from_micros(25 * 8)).next(Duration.from_micros(50))
+        long = record.sound_field(range_, option).skip(Duration.from_micros(25 * 8)).next(Duration.from_micros(50), layout=Layout.Long)
+
+        name = long.columns[-1]
+        assert long.columns == ["time[ns]", "point_idx", name]
+        assert long.height == wide.width * 3
+        assert np.array_equal(long["point_idx"].to_numpy(), np.tile(np.arange(3, dtype=np.uint32), wide.width))
+        time = [int(c.replace(f"{name}@", "").replace("[ns]", "")) for c in wide.columns]
+        assert np.array_equal(long["time[ns]"].to_numpy(), np.repeat(time, 3))
+        assert np.array_equal(long[name].to_numpy(), wide.to_numpy().T.ravel())
+
+
+@pytest.mark.parametrize("option", [InstantRecordOption(), RmsRecordOption()])
+@pytest.mark.parametrize("shards", [1, 2])
+def test_sound_field_grid(option: InstantRecordOption | RmsRecordOption, shards: int):
+    with Emulator([AUTD3(pos=[0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0])]) as emulator:
+        record = emulator.record(record_uniform)
+        range_ = RangeXYZ(x=(-2.0, 2.0), y=(0.0, 2.0), z=(10.0, 11.0), resolution=1.0)
+
+        sound_field = record.sound_field(range_, option, shards=shards)
+        points = sound_field.observe_points()
+        assert sound_field.observe_points() is points
+        assert sound_field.grid_shape == (2, 3, 5)
+        assert np.array_equal(sound_field.axes["x"], [-2.0, -1.0, 0.0, 1.0, 2.0])
+        assert np.array_equal(sound_field.axes["y"], [0.0, 1.0, 2.0])
+        assert np.array_equal(sound_field.axes["z"], [10.0, 11.0])
+
+        expect = record.sound_field(range_, option).next(Duration.from_micros(50)).to_numpy().T
+        time, v = sound_field.next_grid(Duration.from_micros(50))
+        assert v.shape == (len(time), 2, 3, 5)
+        assert np.array_equal(v.reshape(len(time), -1), expect)
+        assert np.array_equal(
+            v[:, 1, 2, 0],
+            expect[:, points.with_row_index().filter((pl.col("x[mm]") == -2.0) & (pl.col("y[mm]") == 2.0) & (pl.col("z[mm]") == 11.0))["index"][0]],
+        )
+
+
+@pytest.mark.parametrize("option", [InstantRecordOption(), RmsRecordOption()])
+def test_sound_field_points(option: InstantRecordOption | RmsRecordOption):
+    with Emulator([AUTD3(pos=[0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0])]) as emulator:
+        record = emulator.record(record_uniform)
+        range_ = RangeXYZ(x=(-2.0, 2.0), y=(0.0, 2.0), z=(10.0, 11.0), resolution=1.0)
+        grid = record.sound_field(range_, option)
+        grid_points = grid.observe_points().to_numpy()
+        expect = grid.next(Duration.from_micros(50)).to_numpy()
+
+        idx = [29, 3, 17, 0]
+        sound_field = record.sound_field(Points(grid_points[idx]), option)
+        assert np.array_equal(sound_field.observe_points().to_numpy(), grid_points[idx])
+        np.testing.assert_allclose(sound_field.next(Duration.from_micros(50)).to_numpy(), expect[idx], rtol=0, atol=1e-5 * np.abs(expect).max())
+        with pytest.raises(ValueError, match="Observation points do not form a grid"):
+            _ = sound_field.grid_shape
+
+        # A failed next_grid leaves the field where it was.
+        sound_field = record.sound_field(Points(grid_points[idx]), option)
+        with pytest.raises(ValueError, match="Observation points do not form a grid"):
+            sound_field.next_grid(Duration.from_micros(100))
+        np.testing.assert_allclose(sound_field.next(Duration.from_micros(50)).to_numpy(), expect[idx], rtol=0, atol=1e-5 * np.abs(expect).max())
+
+    with pytest.raises(ValueError, match=r"Points must be an array of shape \(N, 3\)"):
+        Points(np.zeros((4, 2)))
+    with pytest.raises(ValueError, match="Points must not be empty"):
+        record.sound_field(Points(np.zeros((0, 3))), option)
+
+
+@pytest.mark.parametrize("option", [InstantRecordOption(time_step=Duration.from_micros(1)), RmsRecordOption()])
+def test_sound_field_points_scales(option: InstantRecordOption | RmsRecordOption):
+    # Hundreds of points must not create one native sound field per point. The timing is in benchmarks/points_sound_field.py.
+    with create_emulator() as emulator:
+        record = emulator.record(record_focus_sine)
+        rng = np.random.default_rng(0)
+        points = Points(rng.uniform([0.0, 0.0, 20.0], [180.0, 140.0, 200.0], size=(500, 3)))
+        duration = Duration.from_micros(25 * 4)
+
+        tracemalloc.start()
+        sound_field = record.sound_field(points, option)
+        v = sound_field.next(duration).to_numpy()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert isinstance(sound_field, ReferenceInstant | ReferenceRms)
+        assert v.shape == (500, sound_field._time_len(duration))
+        assert peak < 256 * 1024 * 1024
+
+        sharded = record.sound_field(points, option, shards=3)
+        assert isinstance(sharded, ShardedSoundField)
+        assert [s._points_len() for s in sharded.shards] == [167, 167, 166]
+        assert np.array_equal(sharded.observe_points().to_numpy(), sound_field.observe_points().to_numpy())
+        assert np.array_equal(sharded.next(duration).to_numpy(), v)
+
+
+def next_array(sound_field: SoundField, duration: Duration) -> tuple[np.ndarray, np.ndarray]:
+    n = sound_field._time_len(duration)
+    time = np.zeros(n, dtype=np.uint64)
+    v = np.zeros([n, sound_field._points_len()], dtype=np.float32)
+    sound_field.next_into(duration, time, v)
+    return time, v
+
+
+def record_focus_sine(autd: Recorder) -> None:
+    autd.send((Sine(freq=150 * Hz, option=SineOption()), Focus(pos=[90.0, 70.0, 30.0], option=FocusOption())))
+    autd.tick(Duration.from_micros(25 * 12))
+
+
+@pytest.mark.parametrize("option", [InstantRecordOption(time_step=Duration.from_nanos(2500), memory_limits_hint_mb=1), RmsRecordOption()])
+def test_sound_field_numpy_engine(option: InstantRecordOption | RmsRecordOption, tmp_path: Path):
+    with create_emulator() as emulator:
+        record = emulator.record(record_focus_sine)
+        range_ = RangeXYZ(x=(80.0, 100.0), y=(60.0, 80.0), z=(30.0, 30.0), resolution=5.0)
+        points = Points([[90.0, 70.0, 30.0], [0.0, 0.0, 10.0], [150.0, -20.0, 50.0]])
+
+        for target in (range_, points):
+            native = record.sound_field(target, option).skip(Duration.from_micros(25 * 2))
+            reference = record.sound_field(target, option, engine=Engine.NumPy).skip(Duration.from_micros(25 * 2))
+            assert isinstance(reference, ReferenceInstant | ReferenceRms)
+            assert reference.observe_points().equals(native.observe_points())
+            for _ in range(2):
+                expect_time, expect = next_array(native, Duration.from_micros(25 * 5))
+                time, v = next_array(reference, Duration.from_micros(25 * 5))
+                assert np.array_equal(time, expect_time)
+                assert np.abs(expect).max() > 1.0
+                np.testing.assert_allclose(v, expect, rtol=0, atol=1e-5 * np.abs(expect).max())
+
+        sharded = record.sound_field(range_, option, engine=Engine.NumPy, shards=2)
+        expect = record.sound_field(range_, option, engine=Engine.NumPy).next(Duration.from_micros(25 * 4))
+        assert sharded.next(Duration.from_micros(25 * 4)).equals(expect)
+
+        record.save(tmp_path / "record.bin")
+        loaded = Record.load(tmp_path / "record.bin")
+        assert loaded.sound_field(range_, option).next(Duration.from_micros(25 * 4)).equals(expect)
+
+        reference = record.sound_field(range_, option, engine=Engine.NumPy)
+        with pytest.raises(ValueError, match="Duration must be multiple of 25µs"):
+            reference.next(Duration.from_micros(30))
+        with pytest.raises(ValueError, match="Not recorded"):
+            reference.skip(Duration.from_micros(25 * 13))
+        reference.skip(Duration.from_micros(25 * 12))
+
+
+@pytest.mark.parametrize("option", [InstantRecordOption(time_step=Duration.from_nanos(2500)), RmsRecordOption()])
+def test_sound_field_reduce(option: InstantRecordOption | RmsRecordOption):
+    with create_emulator() as emulator:
+        record = emulator.record(record_focus_sine)
+        range_ = RangeXYZ(x=(80.0, 100.0), y=(60.0, 80.0), z=(30.0, 30.0), resolution=5.0)
+        expect = record.sound_field(range_, option).skip(Duration.from_micros(25)).next(Duration.from_micros(25 * 10)).to_numpy()
+
+        df = (
+            record.sound_field(range_, option)
+            .skip(Duration.from_micros(25))
+            .reduce(Duration.from_micros(25 * 10), ["max", "min", "mean", "rms", "p2p"], Duration.from_micros(25 * 3))
+        )
+        assert df.columns == ["max", "min", "mean", "rms", "p2p"]
+        assert np.array_equal(df["max"].to_numpy(), expect.max(axis=1))
+        assert np.array_equal(df["min"].to_numpy(), expect.min(axis=1))
+        assert np.array_equal(df["p2p"].to_numpy(), expect.max(axis=1) - expect.min(axis=1))
+        np.testing.assert_allclose(df["mean"].to_numpy(), expect.mean(axis=1, dtype=np.float64), rtol=1e-6)
+        np.testing.assert_allclose(df["rms"].to_numpy(), np.sqrt((expect.astype(np.float64) ** 2).mean(axis=1)), rtol=1e-6)
+
+        df = record.sound_field(range_, option).reduce(Duration.from_micros(25 * 10), ["p2p", "max"])
+        assert df.columns == ["p2p", "max"]
+
+        with pytest.raises(ValueError, match="Unknown reducer: median"):
+            record.sound_field(range_, option).reduce(Duration.from_micros(25), ["median"])
+        with pytest.raises(ValueError, match="Duration must contain at least one time step"):
+            record.sound_field(range_, option).reduce(Duration.from_micros(0), ["max"])
+
+
+@pytest.mark.parametrize("option", [InstantRecordOption(time_step=Duration.from_nanos(2500)), RmsRecordOption()])
+def test_sound_field_peaks(option: InstantRecordOption | RmsRecordOption):
+    with create_emulator() as emulator:
+        record = emulator.record(record_focus_sine)
+        range_ = RangeXYZ(x=(80.0, 100.0), y=(60.0, 80.0), z=(30.0, 30.0), resolution=5.0)
+        sound_field = record.sound_field(range_, option)
+        points = sound_field.observe_points()
+        expect = sound_field.next(Duration.from_micros(25 * 10)).to_numpy().T
+
+        df = record.sound_field(range_, option).peaks(Duration.from_micros(25 * 10), chunk=Duration.from_micros(25 * 3))
+        assert df.columns == ["time[ns]", "rank", "point_idx", "x[mm]", "y[mm]", "z[mm]", sound_field._name]
+        assert len(df) == len(expect)
+        idx = expect.argmax(axis=1)
+        assert np.array_equal(df["point_idx"].to_numpy(), idx)
+        assert np.array_equal(df[sound_field._name].to_numpy(), expect.max(axis=1))
+        assert np.array_equal(df["x[mm]"].to_numpy(), points["x[mm]"].to_numpy()[idx])
+        assert np.all(df["rank"].to_numpy() == 0)
+
+        df = record.sound_field(range_, option).peaks(Duration.from_micros(25 * 10), k=3, chunk=Duration.from_micros(25 * 3))
+        assert len(df) == len(expect) * 3
+        v = df[sound_field._name].to_numpy().reshape(-1, 3)
+        assert np.array_equal(v, -np.sort(-expect, axis=1)[:, :3])
+        assert np.array_equal(df["rank"].to_numpy(), np.tile([0, 1, 2], len(expect)))
+        assert np.array_equal(df["time[ns]"].to_numpy(), np.repeat(df["time[ns]"].to_numpy()[::3], 3))
+        assert np.array_equal(expect[np.arange(len(expect)).repeat(3), df["point_idx"].to_numpy()], df[sound_field._name].to_numpy())
+
+        with pytest.raises(ValueError, match="k must be positive"):
+            record.sound_field(range_, option).peaks(Duration.from_micros(25), k=0)
+
+
+def test_sound_field_welch():
+    with create_emulator() as emulator:
+
+        def f(autd: Recorder) -> None:
+            autd.send((Sine(freq=150 * Hz, option=SineOption()), Focus(pos=[90.0, 70.0, 30.0], option=FocusOption())))
+            autd.tick(Duration.from_micros(25 * 40))
+
+        record = emulator.record(f)
+        range_ = RangeXYZ(x=(80.0, 100.0), y=(60.0, 80.0), z=(30.0, 30.0), resolution=10.0)
+        option = InstantRecordOption(time_step=Duration.from_micros(1))
+        duration = Duration.from_micros(25 * 40)
+        v = record.sound_field(range_, option).next(duration).to_numpy().T.astype(np.float64)
+
+        segment, overlap = 100, 60
+        window = np.hanning(segment + 1)[:-1]
+        expect = []
+        for start in range(0, len(v) - segment + 1, segment - overlap):
+            x = v[start : start + segment] - v[start : start + segment].mean(axis=0)
+            expect.append(np.abs(np.fft.rfft(x * window[:, np.newaxis], axis=0)) ** 2)
+        expect = np.mean(expect, axis=0) / (1e6 * np.sum(window**2))
+        expect[1:-1] *= 2.0
+
+        freq, psd = record.sound_field(range_, option).welch(duration, segment, overlap=overlap, chunk=Duration.from_micros(25 * 3))
+        assert np.allclose(freq, np.fft.rfftfreq(segment, 1e-6))
+        assert psd.shape == (segment // 2 + 1, range_._points_len())
+        np.testing.assert_allclose(psd, expect, rtol=1e-9)
+        assert np.all(np.abs(freq[psd.argmax(axis=0)] - 40e3) <= 10e3)
+
+        _, psd_default = record.sound_field(range_, option).welch(duration, segment, chunk=Duration.from_micros(25 * 7))
+        assert psd_default.shape == psd.shape
+
+        with pytest.raises(ValueError, match="segment must be positive"):
+            record.sound_field(range_, option).welch(duration, segment, overlap=segment)
+        with pytest.raises(ValueError, match="Duration is shorter than one segment"):
+            record.sound_field(range_, option).welch(Duration.from_micros(25), segment)
+
+
+def test_estimate_bytes():
+    with create_emulator() as emulator:
+        record = emulator.record(record_focus_sine)
+        end = Duration.from_micros(25 * 4)
+
+        def peak(f: Callable[[], object]) -> int:
+            tracemalloc.start()
+            try:
+                f()
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        # The estimate covers every buffer the accessor allocates, so only the Python objects around them may exceed it.
+        start = Duration.from_micros(25 * 2)
+        for name, kwargs in (
+            ("phase", {}),
+            ("phase", {"start": start, "end": end}),
+            ("pulse_width", {"devices": [1], "transducers": [0, 1]}),
+            ("pulse_width", {"start": start, "end": end, "devices": [1]}),
+            ("output_voltage", {"end": end}),
+            ("output_ultrasound", {"start": start, "end": end, "transducers": [0, 3]}),
+        ):
+            accessor = functools.partial(getattr(record, f"{name}_array"), **kwargs)
+            accessor()
+            expect = record.estimate_bytes(name, **kwargs)
+            assert expect - 32 * 1024 <= peak(accessor) <= expect + 4 * 1024
+        time, v = record.phase_array(start=start, end=end)
+        assert record.estimate_bytes("phase", start=start, end=end) == 12 * 8 + v.nbytes + (12 + 2) * 8 + 498
+        time, v = record.pulse_width_array(devices=[1], transducers=[0, 1])
+        assert record.estimate_bytes("pulse_width", devices=[1], transducers=[0, 1]) == 2 * time.nbytes + 12 * 498 * 2 + 12 * 8 + v.nbytes + 2 * 8
+        for layout in (Layout.Wide, Layout.Long):
+            df = record.output_ultrasound(end=end, layout=layout)
+            expect = record.estimate_bytes("output_ultrasound", end=end, layout=layout)
+            assert expect - record.estimate_bytes("output_ultrasound", end=end) == df.estimated_size()
+
+        chunk = record.plan_chunk("output_voltage", 1)
+        # One period does not fit in 1 MB, so the floor of one period is returned.
+        assert chunk == Duration.from_micros(25)
+        assert record.estimate_bytes("output_voltage", end=chunk) > 1024 * 1024
+        chunk = record.plan_chunk("output_voltage", 4)
+        assert (
+            record.estimate_bytes("output_voltage", end=chunk)
+            <= 4 * 1024 * 1024
+            < record.estimate_bytes("output_voltage", end=chunk + Duration.from_micros(25))
+        )
+        assert record.plan_chunk("phase", 1024) == Duration.from_micros(25 * 12)
+        chunk = record.plan_chunk("output_ultrasound", 2, devices=[0])
+        assert record.estimate_bytes("output_ultrasound", start=chunk, end=chunk + chunk, devices=[0]) <= 2 * 1024 * 1024
+        assert peak(lambda: record.output_ultrasound_array(start=chunk, end=chunk + chunk, devices=[0])) <= 2 * 1024 * 1024
+
+        with pytest.raises(ValueError, match="Unknown array: drive"):
+            record.estimate_bytes("drive")  # type: ignore[arg-type]
+
+        range_ = RangeXYZ(x=(80.0, 100.0), y=(60.0, 80.0), z=(30.0, 30.0), resolution=1.0)
+        for option in (InstantRecordOption(time_step=Duration.from_nanos(2500), memory_limits_hint_mb=1), RmsRecordOption(memory_limits_hint_mb=1)):
+            sound_field = record.sound_field(range_, option)
+            duration = Duration.from_micros(25 * 3)
+            n = sound_field._time_len(duration)
+            assert sound_field.estimate_bytes(duration) == n * 8 + n * range_._points_len() * 4
+            assert (
+                sound_field.estimate_bytes(duration, layout=Layout.Wide) - sound_field.estimate_bytes(duration)
+                == sound_field.next(duration).estimated_size()
+            )
+            assert (
+                sound_field.estimate_bytes(duration, layout=Layout.Long) - sound_field.estimate_bytes(duration)
+                == sound_field.next(duration, layout=Layout.Long).estimated_size()
+            )
+
+            chunk = sound_field.plan_chunk()
+            assert chunk.as_nanos() % (25 * 1000) == 0
+            assert sound_field.estimate_bytes(chunk) <= 1024 * 1024 < sound_field.estimate_bytes(chunk + Duration.from_micros(25))
+            assert sound_field.plan_chunk(1, layout=Layout.Long) < chunk
+            assert sound_field.plan_chunk(0) == Duration.from_micros(25)
+
+
+def test_profiler():
+    with create_emulator() as emulator:
+        record = emulator.record(record_focus_sine)
+        range_ = RangeXYZ(x=(80.0, 100.0), y=(60.0, 80.0), z=(30.0, 30.0), resolution=5.0)
+        dll = NativeMethods().dll
+
+        with Profiler() as profiler:
+            assert NativeMethods().dll is not dll
+            with pytest.raises(RuntimeError, match="Another profiler is already running"):
+                Profiler().start()
+            record.output_voltage(end=Duration.from_micros(25))
+            sound_field = record.sound_field(range_, InstantRecordOption())
+            sound_field.next(Duration.from_micros(25))
+            sound_field.next_grid(Duration.from_micros(25))
+            sound_field.next(Duration.from_micros(25), layout=Layout.Long)
+        assert NativeMethods().dll is dll
+        record.output_voltage(end=Duration.from_micros(25))
+
+        stats = profiler.stats()
+        assert stats.columns == ["name", "calls", "total[s]", "mean[s]", "max[s]", "bytes"]
+        row = stats.filter(pl.col("name") == "AUTDEmulatorRecordOutputVoltage").row(0, named=True)
+        assert row["calls"] == 1
+        assert row["bytes"] == 512 * 498 * 4
+        row = stats.filter(pl.col("name") == "AUTDEmulatorSoundFieldInstantNext").row(0, named=True)
+        assert row["calls"] == 3
+        assert row["bytes"] == 3 * 25 * (8 + range_._points_len() * 4)
+        assert 0.0 < row["max[s]"] <= row["total[s]"]
+        assert stats.filter(pl.col("name") == "DataFrame[Wide]")["calls"].to_list() == [2]
+        assert stats.filter(pl.col("name") == "DataFrame[Long]")["calls"].to_list() == [1]
+        assert stats["total[s]"].is_sorted(descending=True)
+
+        out = io.StringIO()
+        profiler.dump(out)
+        assert "AUTDEmulatorSoundFieldInstantNext" in out.getvalue()
+
+        profiler.reset()
+        assert len(profiler.stats()) == 0
+        profiler.stop()
+
+
+@pytest.mark.parametrize("option", [InstantRecordOption(time_step=Duration.from_nanos(2500)), RmsRecordOption()])
+def test_sound_field_progress(option: InstantRecordOption | RmsRecordOption):
+    with create_emulator() as emulator:
+        record = emulator.record(record_focus_sine)
+        range_ = RangeXYZ(x=(80.0, 100.0), y=(60.0, 80.0), z=(30.0, 30.0), resolution=5.0)
+        duration = Duration.from_micros(25 * 10)
+        expect = record.sound_field(range_, option).next(duration)
+
+        reports: list[Progress] = []
+        df = record.sound_field(range_, option).next(duration, chunk=Duration.from_micros(25 * 3), progress=reports.append)
+        assert df.equals(expect)
+        assert [r.fraction for r in reports] == pytest.approx([0.3, 0.6, 0.9, 1.0])
+        assert reports[-1].eta == 0.0
+        assert all(r.elapsed > 0.0 and r.points_per_second > 0.0 for r in reports)
+        assert "fraction=1.000" in repr(reports[-1])
+
+        _, v = record.sound_field(range_, option).next_grid(duration, cancel=CancellationToken())
+        assert np.array_equal(v.reshape(len(v), -1), expect.to_numpy().T)
+
+        reports.clear()
+        record.sound_field(range_, option).reduce(duration, ["max"], Duration.from_micros(25 * 5), progress=reports.append)
+        assert [r.fraction for r in reports] == pytest.approx([0.5, 1.0])
+
+        cancel = CancellationToken()
+        assert not cancel.cancelled
+
+        def cancel_at_half(p: Progress) -> None:
+            if p.fraction >= 0.5:
+                cancel.cancel()
+
+        sound_field = record.sound_field(range_, option)
+        with pytest.raises(CancelledError, match="Computation was cancelled"):
+            sound_field.next(duration, chunk=Duration.from_micros(25 * 2), progress=cancel_at_half, cancel=cancel)
+        assert cancel.cancelled
+        # The chunks computed before the cancellation are consumed.
+        time, _ = sound_field.next_grid(Duration.from_micros(25))
+        assert time[0] == 25_000 * 6
+
+        chunks = record.sound_field(range_, option).iter_chunks(duration, Duration.from_micros(25 * 2), cancel=cancel)
+        with pytest.raises(CancelledError):
+            next(chunks)
+
+
 def test_sound_field_instant():
     with Emulator([AUTD3(pos=[0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0])]) as emulator:
 
@@ -1228,6 +1841,440 @@ def test_sound_field_rms():
             assert np.allclose(expect[i], sound_field_df[col])
 
 
+@pytest.mark.parametrize("option", [InstantRecordOption(), RmsRecordOption()])
+def test_sound_field_iter_chunks(option: InstantRecordOption | RmsRecordOption):
+    with Emulator([AUTD3(pos=[0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0])]) as emulator:
+
+        def f(autd: Recorder) -> None:
+            autd.send(Uniform(intensity=Intensity(0xFF), phase=Phase(0x40)))
+            autd.tick(Duration.from_micros(25 * 10))
+
+        record = emulator.record(f)
+        range_ = RangeXYZ(x=(-1.0, 1.0), y=(0.0, 0.0), z=(10.0, 10.0), resolution=1.0)
+
+        df = record.sound_field(range_, option).skip(Duration.from_micros(25)).next(Duration.from_micros(25 * 9), layout=Layout.Long)
+        expect_time = np.unique(df["time[ns]"].to_numpy())
+        expect = df.get_columns()[-1].to_numpy().reshape(-1, 3)
+
+        sound_field = record.sound_field(range_, option).skip(Duration.from_micros(25))
+        chunks = list(sound_field.iter_chunks(Duration.from_micros(25 * 9), Duration.from_micros(50)))
+        assert len(chunks) == 5
+        assert len({v.ctypes.data for _, v in chunks}) == 1
+        assert chunks[-1][1].shape[0] * 2 == chunks[0][1].shape[0]
+
+        sound_field = record.sound_field(range_, option).skip(Duration.from_micros(25))
+        time = []
+        values = []
+        for t, v in sound_field.iter_chunks(Duration.from_micros(25 * 9), Duration.from_micros(50)):
+            time.append(t.copy())
+            values.append(v.copy())
+        assert np.array_equal(np.concatenate(time), expect_time)
+        assert np.array_equal(np.concatenate(values), expect)
+
+
+@pytest.mark.parametrize("option", [InstantRecordOption(), RmsRecordOption()])
+def test_sound_field_next_into(option: InstantRecordOption | RmsRecordOption, tmp_path: Path):
+    with Emulator([AUTD3(pos=[0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0])]) as emulator:
+
+        def f(autd: Recorder) -> None:
+            autd.send(Uniform(intensity=Intensity(0xFF), phase=Phase(0x40)))
+            autd.tick(Duration.from_micros(25 * 10))
+
+        record = emulator.record(f)
+        range_ = RangeXYZ(x=(-1.0, 1.0), y=(0.0, 0.0), z=(10.0, 10.0), resolution=1.0)
+
+        df = record.sound_field(range_, option).skip(Duration.from_micros(25 * 8)).next(Duration.from_micros(50), layout=Layout.Long)
+        expect_time = np.unique(df["time[ns]"].to_numpy())
+        expect = df.get_columns()[-1].to_numpy().reshape(-1, 3)
+        n = len(expect_time)
+
+        sound_field = record.sound_field(range_, option).skip(Duration.from_micros(25 * 8))
+        time = np.zeros(n, dtype=np.uint64)
+        values = np.memmap(tmp_path / "values.bin", dtype=np.float32, mode="w+", shape=(n, 3))
+        sound_field.next_into(Duration.from_micros(50), time, values)
+        assert np.array_equal(time, expect_time)
+        assert np.array_equal(values, expect)
+
+        sound_field = record.sound_field(range_, option)
+        with pytest.raises(ValueError, match="out_time must be"):
+            sound_field.next_into(Duration.from_micros(50), np.zeros(n + 1, dtype=np.uint64), np.zeros([n, 3], dtype=np.float32))
+        with pytest.raises(ValueError, match="out_time must be"):
+            sound_field.next_into(Duration.from_micros(50), np.zeros(n, dtype=np.float64), np.zeros([n, 3], dtype=np.float32))
+        with pytest.raises(ValueError, match="out_values must be"):
+            sound_field.next_into(Duration.from_micros(50), np.zeros(n, dtype=np.uint64), np.zeros([n, 4], dtype=np.float32))
+        with pytest.raises(ValueError, match="out_values must be"):
+            sound_field.next_into(Duration.from_micros(50), np.zeros(n, dtype=np.uint64), np.zeros([n, 3], dtype=np.float64))
+        with pytest.raises(ValueError, match="out_values must be C-contiguous and writeable"):
+            sound_field.next_into(Duration.from_micros(50), np.zeros(n, dtype=np.uint64), np.zeros([3, n], dtype=np.float32).T)
+        readonly = np.zeros(n, dtype=np.uint64)
+        readonly.flags.writeable = False
+        with pytest.raises(ValueError, match="out_time must be C-contiguous and writeable"):
+            sound_field.next_into(Duration.from_micros(50), readonly, np.zeros([n, 3], dtype=np.float32))
+
+
+@pytest.mark.parametrize("option", [InstantRecordOption(), RmsRecordOption()])
+def test_sound_field_async(option: InstantRecordOption | RmsRecordOption):
+    with Emulator([AUTD3(pos=[0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0])]) as emulator:
+
+        def f(autd: Recorder) -> None:
+            autd.send(Uniform(intensity=Intensity(0xFF), phase=Phase(0x40)))
+            autd.tick(Duration.from_micros(25 * 10))
+
+        record = emulator.record(f)
+        range_ = RangeXYZ(x=(-1.0, 1.0), y=(0.0, 0.0), z=(10.0, 10.0), resolution=1.0)
+
+        expect = record.sound_field(range_, option).skip(Duration.from_micros(25)).next(Duration.from_micros(25 * 9))
+
+        async def next_async() -> pl.DataFrame:
+            return await record.sound_field(range_, option).skip(Duration.from_micros(25)).anext(Duration.from_micros(25 * 9))
+
+        assert asyncio.run(next_async()).equals(expect)
+
+        async def aiter_chunks() -> np.ndarray:
+            sound_field = record.sound_field(range_, option).skip(Duration.from_micros(25))
+            return np.concatenate([v.copy() async for _, v in sound_field.aiter_chunks(Duration.from_micros(25 * 9), Duration.from_micros(50))])
+
+        assert np.array_equal(asyncio.run(aiter_chunks()), expect.to_numpy().T)
+
+        async def cancel() -> int:
+            received = 0
+            first = asyncio.Event()
+
+            async def consume() -> None:
+                nonlocal received
+                sound_field = record.sound_field(range_, option)
+                async for _ in sound_field.aiter_chunks(Duration.from_micros(25 * 10), Duration.from_micros(25)):
+                    received += 1
+                    first.set()
+                    await asyncio.sleep(1)
+
+            task = asyncio.create_task(consume())
+            await first.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            return received
+
+        assert asyncio.run(cancel()) == 1
+
+        async def cancel_next() -> None:
+            sound_field = record.sound_field(range_, option)
+            reports: list[Progress] = []
+            loop = asyncio.get_running_loop()
+            first = asyncio.Event()
+
+            def slow(p: Progress) -> None:
+                reports.append(p)
+                loop.call_soon_threadsafe(first.set)
+                time.sleep(0.05)
+
+            task = asyncio.create_task(sound_field.anext(Duration.from_micros(25 * 10), chunk=Duration.from_micros(25), progress=slow))
+            await first.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            done = len(reports)
+            assert 1 <= done < 10
+            await asyncio.sleep(0.2)
+            assert len(reports) == done
+
+            df = await sound_field.anext(Duration.from_micros(25))
+            assert df.columns[0].endswith(f"@{done * 25_000}[ns]")
+
+        asyncio.run(cancel_next())
+
+
+def test_sound_field_iter_chunks_memory_limits():
+    with Emulator([AUTD3(pos=[0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0])]) as emulator:
+
+        def f(autd: Recorder) -> None:
+            autd.send(Uniform(intensity=Intensity(0xFF), phase=Phase(0x40)))
+            autd.tick(Duration.from_micros(25 * 10))
+
+        record = emulator.record(f)
+        range_ = RangeXYZ(x=(-1.0, 1.0), y=(0.0, 0.0), z=(10.0, 10.0), resolution=1.0)
+
+        sound_field = record.sound_field(range_, InstantRecordOption(memory_limits_hint_mb=0))
+        assert [v.shape for _, v in sound_field.iter_chunks(Duration.from_micros(25 * 3))] == [(25, 3)] * 3
+
+        sound_field = record.sound_field(range_, InstantRecordOption())
+        assert [v.shape for _, v in sound_field.iter_chunks(Duration.from_micros(25 * 3))] == [(75, 3)]
+
+        sound_field = record.sound_field(range_, RmsRecordOption(memory_limits_hint_mb=0))
+        assert [v.shape for _, v in sound_field.iter_chunks(Duration.from_micros(25 * 3))] == [(1, 3)] * 3
+
+
+@pytest.mark.parametrize("option", [InstantRecordOption(), RmsRecordOption()])
+@pytest.mark.parametrize(
+    ("range_", "shards", "expect_shards"),
+    [
+        (RangeXYZ(x=(-2.0, 2.0), y=(-1.0, 1.0), z=(10.0, 12.0), resolution=1.0), 2, 2),
+        (RangeXYZ(x=(-2.0, 2.0), y=(-1.0, 1.0), z=(10.0, 12.0), resolution=1.0), 10, 3),
+        (RangeXYZ(x=(-2.0, 2.0), y=(-1.0, 1.0), z=(10.0, 10.0), resolution=1.0), 3, 3),
+        (RangeXYZ(x=(-2.0, 2.0), y=(0.0, 0.0), z=(10.0, 10.0), resolution=1.0), 2, 2),
+        (RangeXYZ(x=(0.0, 0.9), y=(0.0, 0.0), z=(10.0, 10.0), resolution=0.3), 3, 3),
+    ],
+)
+def test_sound_field_sharded(option: InstantRecordOption | RmsRecordOption, range_: RangeXYZ, shards: int, expect_shards: int):
+    with Emulator([AUTD3(pos=[0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0])]) as emulator:
+
+        def f(autd: Recorder) -> None:
+            autd.send(Uniform(intensity=Intensity(0xFF), phase=Phase(0x40)))
+            autd.tick(Duration.from_micros(25 * 10))
+
+        record = emulator.record(f)
+
+        expect = record.sound_field(range_, option)
+        sharded = record.sound_field(range_, option, shards=shards)
+        assert isinstance(sharded, ShardedSoundField)
+        assert len(sharded.shards) == expect_shards
+        assert np.allclose(expect.observe_points().to_numpy(), sharded.observe_points().to_numpy())
+
+        expect_df = expect.skip(Duration.from_micros(25 * 8)).next(Duration.from_micros(50))
+        sharded_df = sharded.skip(Duration.from_micros(25 * 8)).next(Duration.from_micros(50))
+        assert expect_df.columns == sharded_df.columns
+        assert np.array_equal(expect_df.to_numpy(), sharded_df.to_numpy())
+
+
+@pytest.mark.parametrize("option", [InstantRecordOption(), RmsRecordOption()])
+def test_sound_field_keeps_record_alive(option: InstantRecordOption | RmsRecordOption):
+    with Emulator([AUTD3(pos=[0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0])]) as emulator:
+        range_ = RangeXYZ(x=(-1.0, 1.0), y=(0.0, 0.0), z=(10.0, 10.0), resolution=1.0)
+        expect = emulator.record(record_uniform).sound_field(range_, option).next(Duration.from_micros(25 * 10))
+        sound_field = emulator.record(record_uniform).sound_field(range_, option)
+        gc.collect()
+        assert sound_field.next(Duration.from_micros(25 * 10)).equals(expect)
+
+
+@pytest.mark.parametrize("option", [InstantRecordOption(time_step=Duration.from_nanos(2500)), RmsRecordOption()])
+def test_compute_time_sharded(option: InstantRecordOption | RmsRecordOption):
+    devices = [AUTD3(pos=[0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0])]
+    range_ = RangeXYZ(x=(-1.0, 1.0), y=(0.0, 0.0), z=(10.0, 10.0), resolution=1.0)
+
+    with Emulator(devices) as emulator:
+        expect = emulator.record(record_uniform).sound_field(range_, option).skip(Duration.from_micros(25)).next(Duration.from_micros(25 * 8))
+
+    with compute_time_sharded(
+        devices,
+        record_uniform,
+        range_,
+        option,
+        Duration.from_micros(25 * 8),
+        skip=Duration.from_micros(25),
+        windows=3,
+        max_workers=2,
+    ) as result:
+        assert result.time.tolist() == [int(c.split("@")[1].replace("[ns]", "")) for c in expect.columns]
+        assert np.array_equal(result.values, expect.to_numpy().T)
+
+    with compute_time_sharded(devices, record_uniform, range_, option, Duration.from_micros(25 * 8), skip=Duration.from_micros(25)) as result:
+        assert np.array_equal(result.values, expect.to_numpy().T)
+
+    with pytest.raises(ValueError, match="Duration must be multiple of 25µs"):
+        compute_time_sharded(devices, record_uniform, range_, option, Duration.from_micros(30))
+
+
+def test_compute_time_sharded_window_count(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    assert _window_count(8, None, None) == 4
+    assert _window_count(2, None, None) == 2
+    assert _window_count(8, None, 3) == 3
+    assert _window_count(8, 5, 3) == 5
+    assert _window_count(0, None, None) == 1
+    monkeypatch.setattr(os, "cpu_count", lambda: None)
+    assert _window_count(8, None, None) == 1
+
+
+@pytest.mark.parametrize("option", [InstantRecordOption(time_step=Duration.from_nanos(2500)), RmsRecordOption()])
+def test_sound_field_to_store(option: InstantRecordOption | RmsRecordOption, tmp_path: Path):
+    with Emulator([AUTD3(pos=[0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0])]) as emulator:
+        record = emulator.record(record_uniform)
+        range_ = RangeXYZ(x=(-2.0, 2.0), y=(0.0, 1.0), z=(10.0, 10.0), resolution=1.0)
+
+        expect = record.sound_field(range_, option).next(Duration.from_micros(25 * 10))
+        expect_time = np.array([int(c.split("@")[1].replace("[ns]", "")) for c in expect.columns], dtype=np.uint64)
+        expect_values = expect.to_numpy().T
+
+        store = record.sound_field(range_, option).to_store(tmp_path / "store", Duration.from_micros(25 * 10), Duration.from_micros(25 * 3))
+        assert len(list(store.chunks())) == 4
+        assert store.name == expect.columns[0].split("@")[0]
+        assert store.shape == (1, 2, 5)
+        assert np.array_equal(store.axes["x"], [-2.0, -1.0, 0.0, 1.0, 2.0])
+        assert np.array_equal(store.points, record.sound_field(range_, option).observe_points().to_numpy())
+
+        store = ChunkStore.open(tmp_path / "store")
+        assert np.array_equal(store.time, expect_time)
+        time, values = store.read()
+        assert np.array_equal(time, expect_time)
+        assert np.array_equal(values, expect_values.reshape(-1, 1, 2, 5))
+
+        time, values = store.read(Duration.from_micros(25 * 4), Duration.from_micros(25 * 6), x=(-1.0, 1.0), y=(1.0, 1.0))
+        rows = (expect_time >= 25000 * 4) & (expect_time < 25000 * 6)
+        assert np.array_equal(time, expect_time[rows])
+        assert np.array_equal(values, expect_values[rows].reshape(-1, 1, 2, 5)[:, :, 1:, 1:4])
+        assert isinstance(values.base, np.memmap)
+
+        time, values = store.read(Duration.from_micros(25 * 2), Duration.from_micros(25 * 7))
+        rows = (expect_time >= 25000 * 2) & (expect_time < 25000 * 7)
+        assert np.array_equal(time, expect_time[rows])
+        assert np.array_equal(values, expect_values[rows].reshape(-1, 1, 2, 5))
+
+        time, values = store.read(Duration.from_micros(25 * 20))
+        assert time.shape == (0,)
+        assert values.shape == (0, 1, 2, 5)
+
+
+def test_record_many(tmp_path: Path):
+    with create_emulator() as emulator:
+        xs = [50.0, 90.0, 130.0]
+        callbacks = [functools.partial(record_focus_at, x) for x in xs]
+        expect = [emulator.record(f).phase_array()[1] for f in callbacks]
+
+        records = emulator.record_many(callbacks, max_workers=2, directory=tmp_path)
+        assert [r.path for r in records] == [tmp_path / f"record_{i:06d}.bin" for i in range(len(xs))]
+        for record, e in zip(records, expect, strict=True):
+            assert np.array_equal(record.phase_array()[1], e)
+            assert record.transducer_table().equals(emulator.transducer_table())
+
+        phases = emulator.record_many(callbacks, max_workers=2, extract=phase_of)
+        for v, e in zip(phases, expect, strict=True):
+            assert np.array_equal(v, e)
+
+        records = emulator.record_many(callbacks[:1], directory=tmp_path / "nested")
+        assert np.array_equal(records[0].phase_array()[1], expect[0])
+
+        assert emulator.record_many([], directory=tmp_path) == []
+        with pytest.raises(ValueError, match="directory is required when extract is not given"):
+            emulator.record_many(callbacks)
+
+        emulator.reconfigure(lambda d: AUTD3(pos=[100.0, 0.0, 0.0] if d.idx() == 1 else [0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0]))
+        expect = emulator.record(callbacks[1]).phase_array()[1]
+        assert not np.array_equal(expect, phases[1])
+        assert np.array_equal(emulator.record_many(callbacks[1:2], extract=phase_of)[0], expect)
+
+
+def test_record_save_load(tmp_path: Path):
+    with create_emulator() as emulator:
+        record = emulator.record(record_uniform)
+        record.save(tmp_path / "record.bin")
+        record.save(tmp_path / "drive.bin", outputs=False)
+
+        loaded = Record.load(tmp_path / "record.bin")
+        assert loaded._cache == {}
+        assert loaded.transducer_table().equals(emulator.transducer_table())
+        for name in ("phase", "pulse_width", "output_voltage", "output_ultrasound"):
+            for kwargs in ({}, {"start": Duration.from_micros(25 * 3), "end": Duration.from_micros(25 * 5), "devices": [1], "transducers": [0, 7]}):
+                expect_time, expect = getattr(record, f"{name}_array")(**kwargs)
+                time, v = getattr(loaded, f"{name}_array")(**kwargs)
+                assert np.array_equal(time, expect_time)
+                assert np.array_equal(v, expect)
+                assert v.dtype == expect.dtype
+            assert getattr(loaded, name)(layout=Layout.Long).equals(getattr(record, name)(layout=Layout.Long))
+        lazy = Record.load(tmp_path / "record.bin")
+        lazy.phase_array()
+        assert set(lazy._cache) == {"time", "phase"}
+
+        loaded = Record.load(tmp_path / "drive.bin")
+        assert loaded.phase().equals(record.phase())
+        with pytest.raises(ValueError, match="output_voltage is not saved in"):
+            loaded.output_voltage()
+
+    (tmp_path / "invalid.bin").write_bytes(b"invalid")
+    with pytest.raises(ValueError, match="is not a record file"):
+        Record.load(tmp_path / "invalid.bin")
+
+
+def test_cache(tmp_path: Path):
+    calls = []
+
+    def f(autd: Recorder) -> None:
+        calls.append(1)
+        record_uniform(autd)
+
+    cache = Cache(tmp_path / "cache")
+    range_ = RangeXYZ(x=(-1.0, 1.0), y=(0.0, 0.0), z=(10.0, 10.0), resolution=1.0)
+    option = InstantRecordOption(time_step=Duration.from_nanos(2500))
+    with create_emulator() as emulator:
+        record = cache.record(emulator, f, key="uniform")
+        assert isinstance(record, Record)
+        cached = cache.record(emulator, f, key="uniform")
+        assert len(calls) == 1
+        assert cached.phase().equals(record.phase())
+        cache.record(emulator, f, key="other")
+        assert len(calls) == 2
+
+        expect = record.sound_field(range_, option).skip(Duration.from_micros(25)).next(Duration.from_micros(25 * 4)).to_numpy().T
+        store = cache.sound_field(record, range_, option, Duration.from_micros(25 * 4), skip=Duration.from_micros(25))
+        assert np.array_equal(store.read()[1].reshape(-1, 3), expect)
+        store = cache.sound_field(cached, range_, option, Duration.from_micros(25 * 4), skip=Duration.from_micros(25))
+        assert np.array_equal(store.read()[1].reshape(-1, 3), expect)
+        expect = record.sound_field(range_, RmsRecordOption()).next(Duration.from_micros(25 * 4)).to_numpy().T
+        store = cache.sound_field(cached, range_, RmsRecordOption(), Duration.from_micros(25 * 4))
+        np.testing.assert_allclose(store.read()[1].reshape(-1, 3), expect, rtol=0, atol=1e-5 * np.abs(expect).max())
+
+    with Emulator([AUTD3(pos=[1.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0])] * 2) as emulator:
+        cache.record(emulator, f, key="uniform")
+        assert len(calls) == 3
+
+    size = cache.size()
+    assert len(cache._entries()) == 5
+    with create_emulator() as emulator:
+        cache.record(emulator, f, key="uniform")
+        cache.max_bytes = size - 1
+        cache._evict()
+        assert len(cache._entries()) == 4
+        cache.record(emulator, f, key="uniform")
+        assert len(calls) == 3
+        cache.record(emulator, f, key="other")
+        assert len(calls) == 4
+
+    cache.clear()
+    assert cache.size() == 0
+
+    # An entry larger than max_bytes is kept until the next one is written.
+    cache = Cache(tmp_path / "small", max_bytes=100)
+    with create_emulator() as emulator:
+        record = cache.record(emulator, f, key="uniform")
+        cache.record(emulator, f, key="uniform")
+        assert len(calls) == 5
+        assert len(cache._entries()) == 1
+        store = cache.sound_field(record, range_, RmsRecordOption(), Duration.from_micros(25 * 4))
+        assert store.read()[1].size == 4 * 3
+        assert [p.parent.name for p, _ in cache._entries()] == ["sound_fields"]
+        assert cache.sound_field(record, range_, RmsRecordOption(), Duration.from_micros(25 * 4)).read()[1].size == 4 * 3
+
+
+def test_record_adaptive_rms():
+    with Emulator([AUTD3(pos=[0.0, 0.0, 0.0], rot=[1.0, 0.0, 0.0, 0.0])]) as emulator:
+        focus = emulator.center() + np.array([0.0, 0.0, 150.0])
+
+        def f(autd: Recorder) -> None:
+            autd.send(Silencer.disable())
+            autd.send(Focus(pos=focus, option=FocusOption()))
+            autd.tick(Duration.from_micros(25 * 2))
+
+        record = emulator.record(f)
+        coarse = RangeXYZ(x=(focus[0] - 40.0, focus[0] + 40.0), y=(focus[1] - 40.0, focus[1] + 40.0), z=(focus[2], focus[2]), resolution=8.0)
+        fine = RangeXYZ(x=(focus[0] - 40.0, focus[0] + 40.0), y=(focus[1] - 40.0, focus[1] + 40.0), z=(focus[2], focus[2]), resolution=1.0)
+        expect = record.sound_field(fine, RmsRecordOption()).next(Duration.from_micros(50))
+
+        df = record.adaptive_rms(coarse, 1.0, threshold=1500.0, gradient=300.0, duration=Duration.from_micros(50))
+        assert df.columns == ["x[mm]", "y[mm]", "z[mm]", "resolution[mm]", *expect.columns]
+        assert df.height < expect.height // 5
+        assert set(df["resolution[mm]"].unique().to_list()) == {1.0, 2.0, 4.0, 8.0}
+        assert df.select(pl.exclude("^.*mm]$")).max().equals(expect.max())
+        points = df.select("x[mm]", "y[mm]", "z[mm]").to_numpy()
+        assert len(np.unique(points, axis=0)) == df.height
+        assert {tuple(p) for p in coarse._coordinates().tolist()} <= {tuple(p) for p in points.tolist()}
+        values = record.sound_field(Points(points), RmsRecordOption()).next(Duration.from_micros(50))
+        assert df.select(expect.columns).to_numpy().T.tolist() == values.to_numpy().T.tolist()
+        assert df.filter(pl.col("resolution[mm]") == 1.0).select(expect.columns[0]).min().item() < 1500.0
+
+        df = record.adaptive_rms(coarse, 1.0, threshold=1e9, skip=Duration.from_micros(25), engine=Engine.NumPy)
+        assert df.height == coarse._points_len()
+        assert (df["resolution[mm]"] == 8.0).all()
+
+
 def test_record_invalid_tick():
     with create_emulator() as emulator:
 
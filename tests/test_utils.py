@@ -0,0 +1,25 @@
+import ctypes
+
+import numpy as np
+import pytest
+
+from pyautd3_emulator.utils import _row_pointers
+
+
+@pytest.mark.parametrize("rows", [0, 1, 7])
+def test_row_pointers(rows: int):
+    v = np.zeros([rows, 5], dtype=np.uint16)
+    ptrs = _row_pointers(v, ctypes.c_uint16)
+    assert [ctypes.addressof(ptrs[i].contents) for i in range(rows)] == [v[i].ctypes.data for i in range(rows)]
+
+
+def test_row_pointers_column_slice():
+    v = np.arange(4 * 6, dtype=np.float32).reshape(4, 6)
+    ptrs = _row_pointers(v[:, 2:5], ctypes.c_float)
+    assert [ptrs[i][0] for i in range(4)] == list(v[:, 2])
+
+
+def test_row_pointers_non_contiguous():
+    v = np.zeros([4, 6], dtype=np.float32)
+    with pytest.raises(ValueError, match="Rows must be C-contiguous"):
+        _row_pointers(v[:, ::2], ctypes.c_float)